@@ -7,11 +7,37 @@ DEFAULT_CONFIG = {
     "screenshots_folder": "",
     "layout": "popup",  # "popup" or "side_panel"
     "theme": "light",  # "light" or "dark"
+    "tiled_ocr": False,  # OCR screenshots as overlapping tiles (slower)
 }
 
+# Last loaded/saved config, so getters don't re-read the file every call,
+# and config.json's mtime when it was cached. A changed mtime means the file
+# was edited by hand, so it's read again rather than overwritten on save.
+_cache = None
+_cache_mtime = None
+
 
 def load_config() -> dict:
     """Load config from file, or return defaults if not found."""
+    global _cache, _cache_mtime
+    mtime = _get_mtime()
+    if _cache is None or mtime != _cache_mtime:
+        _cache = _read_config()
+        _cache_mtime = mtime
+    # Copy so callers can modify it before save_config()
+    return _cache.copy()
+
+
+def _get_mtime():
+    """Get config.json's modification time, or None if it doesn't exist."""
+    try:
+        return CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_config() -> dict:
+    """Read config from disk, merged over the defaults."""
     if CONFIG_PATH.exists():
         try:
             with open(CONFIG_PATH, 'r') as f:
@@ -25,8 +51,11 @@ def load_config() -> dict:
 
 def save_config(config: dict):
     """Save config to file."""
+    global _cache, _cache_mtime
     with open(CONFIG_PATH, 'w') as f:
         json.dump(config, f, indent=2)
+    _cache = config.copy()
+    _cache_mtime = _get_mtime()
 
 
 def get_screenshots_folder() -> str:
@@ -72,3 +101,9 @@ def set_theme(theme: str):
     cfg = load_config()
     cfg["theme"] = theme
     save_config(cfg)
+
+
+def get_tiled_ocr() -> bool:
+    """Get whether screenshots are OCR'd as tiles."""
+    cfg = load_config()
+    return cfg.get("tiled_ocr", False)
@@ -1,4 +1,8 @@
+import os
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -7,46 +11,213 @@ import config
 
 DB_PATH = Path(__file__).parent / "screenshots.db"
 
+# Applied once when each connection is opened. WAL with synchronous=NORMAL
+# avoids an fsync per commit during scans; the larger cache and mmap keep
+# the FTS index pages in memory between searches.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Stored in PRAGMA user_version; bump when init_db() must migrate old databases
+SCHEMA_VERSION = 3
+
+# Statements run on every scan/search are kept as constants so each call
+# passes the same string and hits the connection's prepared-statement cache
+SQL_INSERT = (
+    "INSERT OR IGNORE INTO screenshots_meta (file_path, extracted_text, indexed_date) "
+    "VALUES (?, ?, ?)"
+)
+SQL_IS_INDEXED = "SELECT 1 FROM screenshots_meta WHERE file_path = ?"
+SQL_INDEXED_PATHS = "SELECT file_path FROM screenshots_meta"
+SQL_GET_TEXT = "SELECT extracted_text FROM screenshots_meta WHERE file_path = ?"
+SQL_COUNT = "SELECT COUNT(*) as count FROM screenshots_meta"
+SQL_LAST_SCAN = "SELECT last_scan_mtime FROM scan_meta WHERE folder = ?"
+SQL_SEARCH = """
+    SELECT
+        m.file_path,
+        snippet(screenshots, 1, '[', ']', '...', 30) as snippet
+    FROM screenshots
+    JOIN screenshots_meta m ON m.id = screenshots.rowid
+    WHERE {conditions}
+    ORDER BY rank
+    LIMIT ?
+"""
+
+# Look-back window for each search date filter other than 'today'
+DATE_FILTER_DAYS = {'week': 7, 'month': 30, 'year': 365}
+
+# Room for the statements above plus every search filter combination
+CACHED_STATEMENTS = 256
+
+# Max ids bound per DELETE ... IN (...) statement
+DELETE_CHUNK_SIZE = 500
+
+# Threads used to check file existence in delete_missing_files()
+EXISTS_CHECK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# ((root, root mtime), folders) from the last get_folders() call. Adding a
+# month folder doesn't touch the root's mtime, so scans clear this explicitly.
+_folders_cache = None
+
+# One connection per thread, opened lazily and kept for the life of the thread
+_local = threading.local()
+
+# Serializes writes between the UI thread and the scan thread
+_write_lock = threading.Lock()
+
 
 def get_connection():
-    """Get a connection to the SQLite database."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Get this thread's connection to the SQLite database."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(
+            DB_PATH,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=CACHED_STATEMENTS
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        _local.conn = conn
     return conn
 
 
+@contextmanager
+def _transaction():
+    """Run a block of writes as a single transaction on this thread's connection."""
+    conn = get_connection()
+    with _write_lock:
+        conn.execute("BEGIN")
+        try:
+            yield conn.cursor()
+            # Inside the try so a failed COMMIT (e.g. "database is locked")
+            # doesn't leave this thread's connection stuck in a transaction
+            conn.execute("COMMIT")
+        except BaseException:
+            # Some errors already roll the transaction back themselves
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+
 def init_db():
     """Initialize the database with FTS5 virtual table."""
-    conn = get_connection()
-    cursor = conn.cursor()
+    with _transaction() as cursor:
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        has_tables = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'screenshots'"
+        ).fetchone() is not None
+
+        if has_tables and version < 2:
+            # Older layouts kept the text inside the FTS table; move it aside
+            # and copy it into the content table once the new schema exists
+            cursor.execute("ALTER TABLE screenshots RENAME TO screenshots_old")
+            cursor.execute("DROP TABLE IF EXISTS screenshots_meta")
+
+        elif has_tables and version < 3:
+            # v2's index used the default tokenizer; it is rebuilt from the
+            # content table below. The triggers look it up by name, so they stay.
+            cursor.execute("DROP TABLE screenshots")
+
+        _create_schema(cursor)
+
+        if has_tables and version == 2:
+            cursor.execute("INSERT INTO screenshots (screenshots) VALUES ('rebuild')")
+
+        if has_tables and version < 2:
+            cursor.execute("""
+                INSERT OR IGNORE INTO screenshots_meta (file_path, extracted_text, indexed_date)
+                SELECT file_path, extracted_text, indexed_date FROM screenshots_old
+                ORDER BY rowid
+            """)
+            cursor.execute("DROP TABLE screenshots_old")
+
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def _create_schema(cursor):
+    """Create the content table, its FTS5 index, and the triggers linking them."""
+    # Regular table holding the data; file_path is a B-tree key for lookups
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS screenshots_meta (
+            id INTEGER PRIMARY KEY,
+            file_path TEXT NOT NULL UNIQUE,
+            extracted_text TEXT,
+            indexed_date TEXT
+        )
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_meta_date ON screenshots_meta(indexed_date)"
+    )
+
+    # Newest file mtime seen by the last completed scan of each folder, so
+    # rescans only look at files modified since
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_meta (
+            folder TEXT PRIMARY KEY,
+            last_scan_mtime REAL
+        )
+    """)
 
-    # Create FTS5 virtual table for full-text search
+    # External-content FTS5 table: stores only the token index and reads
+    # column values (for snippet() etc.) back from screenshots_meta.
+    # Porter stemming and diacritic folding let "running" find "run" and
+    # "cafe" find "café", which helps with noisy OCR text.
     cursor.execute("""
         CREATE VIRTUAL TABLE IF NOT EXISTS screenshots USING fts5(
-            file_path,
+            file_path UNINDEXED,
             extracted_text,
-            indexed_date
+            indexed_date UNINDEXED,
+            content='screenshots_meta',
+            content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2'
         )
     """)
 
-    conn.commit()
-    conn.close()
+    # Keep the FTS index in sync with the content table
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS screenshots_meta_ai AFTER INSERT ON screenshots_meta BEGIN
+            INSERT INTO screenshots (rowid, file_path, extracted_text, indexed_date)
+            VALUES (new.id, new.file_path, new.extracted_text, new.indexed_date);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS screenshots_meta_ad AFTER DELETE ON screenshots_meta BEGIN
+            INSERT INTO screenshots (screenshots, rowid, file_path, extracted_text, indexed_date)
+            VALUES ('delete', old.id, old.file_path, old.extracted_text, old.indexed_date);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS screenshots_meta_au AFTER UPDATE ON screenshots_meta BEGIN
+            INSERT INTO screenshots (screenshots, rowid, file_path, extracted_text, indexed_date)
+            VALUES ('delete', old.id, old.file_path, old.extracted_text, old.indexed_date);
+            INSERT INTO screenshots (rowid, file_path, extracted_text, indexed_date)
+            VALUES (new.id, new.file_path, new.extracted_text, new.indexed_date);
+        END
+    """)
 
 
 def add_screenshot(file_path: str, extracted_text: str):
     """Add a screenshot to the database."""
-    conn = get_connection()
-    cursor = conn.cursor()
+    add_screenshots([(file_path, extracted_text)])
 
-    indexed_date = datetime.now().isoformat()
 
-    cursor.execute(
-        "INSERT INTO screenshots (file_path, extracted_text, indexed_date) VALUES (?, ?, ?)",
-        (file_path, extracted_text, indexed_date)
-    )
+def add_screenshots(rows: list[tuple[str, str]]):
+    """Add many (file_path, extracted_text) rows in a single transaction."""
+    indexed_date = datetime.now().isoformat()
 
-    conn.commit()
-    conn.close()
+    # The insert trigger adds each row to the FTS index; paths that are
+    # already indexed are left as they are
+    with _transaction() as cursor:
+        cursor.executemany(
+            SQL_INSERT,
+            [(file_path, extracted_text, indexed_date) for file_path, extracted_text in rows]
+        )
 
 
 def is_indexed(file_path: str) -> bool:
@@ -54,14 +225,31 @@ def is_indexed(file_path: str) -> bool:
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
-        "SELECT file_path FROM screenshots WHERE file_path = ?",
-        (file_path,)
-    )
+    cursor.execute(SQL_IS_INDEXED, (file_path,))
 
-    result = cursor.fetchone() is not None
-    conn.close()
-    return result
+    return cursor.fetchone() is not None
+
+
+def get_indexed_paths() -> set[str]:
+    """Get the paths of all indexed files, for bulk membership checks."""
+    conn = get_connection()
+    return {row[0] for row in conn.execute(SQL_INDEXED_PATHS)}
+
+
+def get_last_scan_mtime(folder: str) -> Optional[float]:
+    """Get the newest mtime seen by the last completed scan of a folder, if any."""
+    conn = get_connection()
+    row = conn.execute(SQL_LAST_SCAN, (folder,)).fetchone()
+    return row[0] if row else None
+
+
+def set_last_scan_mtime(folder: str, mtime: float):
+    """Record the newest mtime seen by a completed scan of a folder."""
+    with _transaction() as cursor:
+        cursor.execute(
+            "INSERT OR REPLACE INTO scan_meta (folder, last_scan_mtime) VALUES (?, ?)",
+            (folder, mtime)
+        )
 
 
 def search(
@@ -79,67 +267,64 @@ def search(
         date_filter: One of 'today', 'week', 'month', 'year', or None for all
         folder_filter: Folder path to filter by, or None for all
 
-    Returns list of dicts with file_path, extracted_text, and snippet.
+    Returns list of dicts with file_path and snippet. The full text is left
+    out (it can be kilobytes per row); use get_screenshot_text() when needed.
     """
     conn = get_connection()
     cursor = conn.cursor()
+    # Plain tuples are cheaper than sqlite3.Row and are unpacked positionally below
+    cursor.row_factory = None
 
-    # Use FTS5 MATCH for full-text search with snippet
-    cursor.execute("""
-        SELECT
-            file_path,
-            extracted_text,
-            snippet(screenshots, 1, '>>>', '<<<', '...', 30) as snippet,
-            indexed_date
-        FROM screenshots
-        WHERE screenshots MATCH ?
-        ORDER BY rank
-        LIMIT ?
-    """, (query, limit * 10))  # Fetch more to filter in Python
-
-    results = []
-
-    # Calculate date threshold if filtering
-    date_threshold = None
-    if date_filter:
-        now = datetime.now()
-        if date_filter == 'today':
-            date_threshold = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif date_filter == 'week':
-            date_threshold = now - timedelta(days=7)
-        elif date_filter == 'month':
-            date_threshold = now - timedelta(days=30)
-        elif date_filter == 'year':
-            date_threshold = now - timedelta(days=365)
-
-    for row in cursor.fetchall():
-        file_path = row['file_path']
-
-        # Apply folder filter
-        if folder_filter and folder_filter != "All Folders":
-            if folder_filter not in file_path:
-                continue
-
-        # Apply date filter
-        if date_threshold:
-            try:
-                indexed_date = datetime.fromisoformat(row['indexed_date'])
-                if indexed_date < date_threshold:
-                    continue
-            except (ValueError, TypeError):
-                pass
-
-        results.append({
+    conditions = ["screenshots MATCH ?"]
+    params = [query]
+
+    date_threshold = _date_threshold(date_filter)
+    if date_threshold:
+        conditions.append("m.indexed_date >= ?")
+        params.append(date_threshold)
+
+    # Folder filter values are relative to the screenshots root ("2024/01")
+    if folder_filter and folder_filter != "All Folders":
+        prefix = os.path.join(Path(config.get_screenshots_folder(), folder_filter), "")
+        conditions.append("m.file_path LIKE ? ESCAPE '!'")
+        params.append(_escape_like(prefix) + "%")
+
+    params.append(limit)
+
+    # Use FTS5 MATCH for full-text search with snippet; filters run in SQLite
+    # so it can stop as soon as LIMIT rows qualify
+    cursor.execute(SQL_SEARCH.format(conditions=" AND ".join(conditions)), params)
+
+    return [
+        {
             'file_path': file_path,
-            'extracted_text': row['extracted_text'],
-            'snippet': row['snippet']
-        })
+            'snippet': snippet
+        }
+        for file_path, snippet in cursor
+    ]
 
-        if len(results) >= limit:
-            break
 
-    conn.close()
-    return results
+def _date_threshold(date_filter: Optional[str]) -> Optional[str]:
+    """
+    Get the earliest indexed_date a date filter allows, as an ISO-8601 string.
+
+    indexed_date is stored with datetime.isoformat(), and ISO-8601 strings sort
+    chronologically, so rows can be compared against this without parsing.
+    """
+    if not date_filter:
+        return None
+
+    now = datetime.now()
+    if date_filter == 'today':
+        return now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    if date_filter in DATE_FILTER_DAYS:
+        return (now - timedelta(days=DATE_FILTER_DAYS[date_filter])).isoformat()
+    return None
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so the value matches literally (ESCAPE '!')."""
+    return value.replace('!', '!!').replace('%', '!%').replace('_', '!_')
 
 
 def get_stats() -> dict:
@@ -147,10 +332,9 @@ def get_stats() -> dict:
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute("SELECT COUNT(*) as count FROM screenshots")
+    cursor.execute(SQL_COUNT)
     count = cursor.fetchone()['count']
 
-    conn.close()
     return {'total_indexed': count}
 
 
@@ -159,26 +343,45 @@ def delete_missing_files():
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute("SELECT rowid, file_path FROM screenshots")
+    cursor.execute("SELECT id, file_path FROM screenshots_meta")
     rows = cursor.fetchall()
 
-    deleted = 0
-    for row in rows:
-        if not Path(row['file_path']).exists():
-            cursor.execute("DELETE FROM screenshots WHERE rowid = ?", (row['rowid'],))
-            deleted += 1
+    # stat() releases the GIL, so overlapping the checks hides disk latency
+    with ThreadPoolExecutor(max_workers=EXISTS_CHECK_WORKERS) as executor:
+        exists_flags = executor.map(os.path.exists, [row['file_path'] for row in rows])
+        missing = [row['id'] for row, exists in zip(rows, exists_flags) if not exists]
+    if not missing:
+        return 0
+
+    # One DELETE per chunk of rows rather than per file; the delete trigger
+    # removes them from the FTS index
+    with _transaction() as cursor:
+        for start in range(0, len(missing), DELETE_CHUNK_SIZE):
+            chunk = missing[start:start + DELETE_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"DELETE FROM screenshots_meta WHERE id IN ({placeholders})", chunk)
 
-    conn.commit()
-    conn.close()
-    return deleted
+    return len(missing)
 
 
 def get_folders() -> list[str]:
     """Get list of subfolders in the screenshots directory."""
-    folders = ["All Folders"]
+    global _folders_cache
 
     screenshots_root = Path(config.get_screenshots_folder())
-    if screenshots_root.exists():
+    try:
+        root_mtime = screenshots_root.stat().st_mtime
+    except OSError:
+        root_mtime = None
+
+    # Reuse the last listing while the root folder is unchanged
+    cache_key = (screenshots_root, root_mtime)
+    if _folders_cache and _folders_cache[0] == cache_key:
+        return list(_folders_cache[1])
+
+    folders = ["All Folders"]
+
+    if root_mtime is not None:
         for item in sorted(screenshots_root.iterdir(), reverse=True):
             if item.is_dir():
                 # Add year folder
@@ -188,7 +391,14 @@ def get_folders() -> list[str]:
                     if subitem.is_dir():
                         folders.append(f"{item.name}/{subitem.name}")
 
-    return folders
+    _folders_cache = (cache_key, folders)
+    return list(folders)
+
+
+def clear_folders_cache():
+    """Forget the cached folder list (e.g. after a scan adds month folders)."""
+    global _folders_cache
+    _folders_cache = None
 
 
 def get_screenshot_text(file_path: str) -> str:
@@ -196,12 +406,8 @@ def get_screenshot_text(file_path: str) -> str:
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
-        "SELECT extracted_text FROM screenshots WHERE file_path = ?",
-        (file_path,)
-    )
+    cursor.execute(SQL_GET_TEXT, (file_path,))
 
     row = cursor.fetchone()
-    conn.close()
 
     return row['extracted_text'] if row else ""
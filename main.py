@@ -1,15 +1,22 @@
+import io
+import multiprocessing
 import os
+import queue
+import subprocess
+import sys
 import threading
 import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
 
-from PIL import Image, ImageTk
+from PIL import ImageTk
 
 import config
 import database
-import ocr_engine
-import scanner
+import thumbnails
 
 # Configuration
 THUMBNAIL_SIZE = (120, 120)
@@ -17,60 +24,273 @@ PREVIEW_SIZE = (500, 500)
 COLUMNS = 4
 MAX_SNIPPET_LENGTH = 60
 
+# Results are drawn straight onto the canvas as a virtual grid: the scroll
+# region covers every result, but items only exist for rows near the viewport
+ROW_HEIGHT = 220
+CELL_WIDTH = THUMBNAIL_SIZE[0] + 30
+CELL_PADDING = 10
+THUMBNAIL_WORKERS = os.cpu_count() or 4
+
+# Thumbnail PhotoImages kept across searches and scrolling (~60 KB each)
+MAX_CACHED_PHOTOS = 500
+
+# Typing searches once the user pauses for this long
+SEARCH_DEBOUNCE_MS = 150
+
+# Scan progress is shown at most this often (~30 times a second)
+PROGRESS_UPDATE_MS = 33
+
+
 # Theme colors
+@dataclass(frozen=True, slots=True)
+class Theme:
+    """One theme's colors, read as attributes rather than by dict key."""
+    bg: str
+    fg: str
+    entry_bg: str
+    entry_fg: str
+    canvas_bg: str
+    text_bg: str
+    text_fg: str
+    button_bg: str
+    highlight: str
+    border: str
+
+
 THEMES = {
-    "light": {
-        "bg": "#f5f5f5",
-        "fg": "#1a1a1a",
-        "entry_bg": "#ffffff",
-        "entry_fg": "#1a1a1a",
-        "canvas_bg": "#ffffff",
-        "text_bg": "#ffffff",
-        "text_fg": "#1a1a1a",
-        "button_bg": "#e0e0e0",
-        "highlight": "#0078d4",
-        "border": "#cccccc",
-    },
-    "dark": {
-        "bg": "#1e1e1e",
-        "fg": "#d4d4d4",
-        "entry_bg": "#2d2d2d",
-        "entry_fg": "#d4d4d4",
-        "canvas_bg": "#252526",
-        "text_bg": "#1e1e1e",
-        "text_fg": "#d4d4d4",
-        "button_bg": "#3c3c3c",
-        "highlight": "#007acc",
-        "border": "#3c3c3c",
-    }
+    "light": Theme(
+        bg="#f5f5f5",
+        fg="#1a1a1a",
+        entry_bg="#ffffff",
+        entry_fg="#1a1a1a",
+        canvas_bg="#ffffff",
+        text_bg="#ffffff",
+        text_fg="#1a1a1a",
+        button_bg="#e0e0e0",
+        highlight="#0078d4",
+        border="#cccccc",
+    ),
+    "dark": Theme(
+        bg="#1e1e1e",
+        fg="#d4d4d4",
+        entry_bg="#2d2d2d",
+        entry_fg="#d4d4d4",
+        canvas_bg="#252526",
+        text_bg="#1e1e1e",
+        text_fg="#d4d4d4",
+        button_bg="#3c3c3c",
+        highlight="#007acc",
+        border="#3c3c3c",
+    ),
 }
 
+# Opens a file or folder with the system's default application
+if sys.platform == 'win32':
+    open_with_system = os.startfile
+elif sys.platform == 'darwin':
+    def open_with_system(path):
+        subprocess.Popen(['open', str(path)])
+else:
+    def open_with_system(path):
+        subprocess.Popen(['xdg-open', str(path)])
+
+
+def theme_settings(colors):
+    """Build ttk.Style.theme_create() settings for one of THEMES."""
+    bg, fg, entry_bg, entry_fg = colors.bg, colors.fg, colors.entry_bg, colors.entry_fg
+    button_bg, highlight, border = colors.button_bg, colors.highlight, colors.border
+
+    return {
+        # Configure all widget styles
+        ".": {"configure": {
+            "background": bg,
+            "foreground": fg,
+            "fieldbackground": entry_bg,
+            "troughcolor": entry_bg,
+            "borderwidth": 1,
+        }},
+        "TFrame": {"configure": {"background": bg}},
+        "TLabel": {"configure": {"background": bg, "foreground": fg}},
+
+        # Buttons with better styling
+        "TButton": {
+            "configure": {
+                "background": button_bg,
+                "foreground": fg,
+                "bordercolor": border,
+                "lightcolor": button_bg,
+                "darkcolor": button_bg,
+                "padding": (10, 5),
+                "borderwidth": 1,
+                "focuscolor": highlight,
+            },
+            "map": {
+                "background": [("active", highlight),
+                               ("pressed", highlight),
+                               ("disabled", bg)],
+                "foreground": [("active", "#ffffff"),
+                               ("disabled", "#666666")],
+                "bordercolor": [("active", highlight)],
+            },
+        },
+
+        # Entry fields
+        "TEntry": {"configure": {
+            "fieldbackground": entry_bg,
+            "foreground": entry_fg,
+            "insertcolor": fg,
+            "bordercolor": border,
+            "lightcolor": border,
+            "darkcolor": border,
+            "borderwidth": 1,
+            "padding": 5,
+        }},
+
+        # Combobox
+        "TCombobox": {
+            "configure": {
+                "fieldbackground": entry_bg,
+                "foreground": entry_fg,
+                "background": button_bg,
+                "arrowcolor": fg,
+                "bordercolor": border,
+                "lightcolor": border,
+                "darkcolor": border,
+                "borderwidth": 1,
+                "padding": 5,
+            },
+            "map": {
+                "fieldbackground": [("readonly", entry_bg),
+                                    ("disabled", bg)],
+                "foreground": [("readonly", entry_fg)],
+                "background": [("readonly", button_bg)],
+            },
+        },
+
+        # Radiobutton
+        "TRadiobutton": {
+            "configure": {
+                "background": bg,
+                "foreground": fg,
+                "indicatorbackground": entry_bg,
+                "indicatorforeground": highlight,
+            },
+            "map": {
+                "background": [("active", bg)],
+                "indicatorbackground": [("selected", highlight)],
+            },
+        },
+
+        # LabelFrame
+        "TLabelframe": {"configure": {
+            "background": bg,
+            "foreground": fg,
+            "bordercolor": border,
+            "lightcolor": border,
+            "darkcolor": border,
+        }},
+        "TLabelframe.Label": {"configure": {
+            "background": bg,
+            "foreground": fg,
+        }},
+
+        # Scrollbar
+        "Vertical.TScrollbar": {
+            "configure": {
+                "background": button_bg,
+                "troughcolor": entry_bg,
+                "bordercolor": border,
+                "arrowcolor": fg,
+                "lightcolor": button_bg,
+                "darkcolor": button_bg,
+            },
+            "map": {
+                "background": [("active", highlight),
+                               ("pressed", highlight)],
+            },
+        },
+
+        # Progress bar
+        "Horizontal.TProgressbar": {"configure": {
+            "background": highlight,
+            "troughcolor": entry_bg,
+            "bordercolor": bg,
+            "lightcolor": highlight,
+            "darkcolor": highlight,
+        }},
+
+        # PanedWindow
+        "TPanedwindow": {"configure": {"background": bg}},
+    }
+
 
 class ScreenshotSearchApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Screenshot Search")
 
-        # Store image references to prevent garbage collection
-        self.thumbnail_refs = []
+        # Store image references to prevent garbage collection. Thumbnails are
+        # an LRU keyed by path, so results that come back are shown instantly.
+        self.thumbnail_refs = OrderedDict()
         self.preview_image_ref = None
 
+        # Current search results and the grid cells drawn for them
+        self.results = []
+        self.rendered_results = set()
+        self.result_rows = 0
+        self.render_pending = False
+
+        # Canvas items per drawn result: clickable item id -> result index,
+        # file path -> (image item, status text item, snippet item). Cells
+        # from the previous search are moved into place when a path reappears.
+        self.result_items = {}
+        self.result_cells = {}
+        self.reusable_cells = {}
+
+        # Thumbnails are decoded on worker threads, then handed to the Tk thread
+        self.thumb_executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS)
+        self.thumb_futures = {}
+
+        # Trim the on-disk thumbnail cache without delaying startup
+        self.thumb_executor.submit(thumbnails.prune_cache)
+
+        # Searches run on a dedicated worker so the UI never waits on SQLite.
+        # Each one is numbered so results from a superseded query are dropped.
+        self.search_queue = queue.Queue()
+        self.search_seq = 0
+        self.pending_search = None
+        threading.Thread(target=self.search_worker, daemon=True).start()
+
         # Currently selected result
         self.selected_result = None
 
-        # Scanning state
+        # Scanning state. The scan thread stores its latest progress and the
+        # Tk thread picks it up, with at most one update scheduled at a time.
         self.is_scanning = False
+        self.scan_progress = None
+        self.progress_update_pending = False
+
+        # Scans run on one long-lived worker instead of a new thread per click
+        self.scan_requests = queue.Queue()
+        threading.Thread(target=self.scan_worker, daemon=True).start()
+
+        # Set when the window closes, so a running scan stops and cancels its
+        # queued OCR instead of finishing invisibly after the window is gone
+        self.scan_stop = threading.Event()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Layout mode
         self.layout = config.get_layout()
 
-        # Main content container (will be rebuilt on layout change)
+        # Main content container, and each layout's (main content, results
+        # container) once built; hidden layouts are kept for switching back
         self.main_content = None
+        self.layout_frames = {}
 
         # Theme
         self.theme = config.get_theme()
 
-        # Settings window reference (for theme updates)
+        # Settings dialog, built on first open and hidden (not destroyed) on close
         self.settings_window = None
 
         # Set window size based on layout
@@ -81,28 +301,45 @@ class ScreenshotSearchApp:
             self.root.geometry("800x600")
             self.root.minsize(600, 400)
 
-        # Initialize database
-        database.init_db()
-
-        # Check Tesseract
-        if not ocr_engine.is_tesseract_available():
-            messagebox.showwarning(
-                "Tesseract Not Found",
-                "Tesseract OCR is not installed or not in PATH.\n\n"
-                "Please install from:\n"
-                "https://github.com/UB-Mannheim/tesseract/wiki\n\n"
-                "The app will still work for searching already-indexed screenshots."
-            )
+        # Check Tesseract once the window is up; it spawns a subprocess
+        self.root.after(0, self.check_tesseract)
 
         self.setup_ui()
         self.apply_theme()
-        self.update_status()
-        self.load_folders()
+
+        # Open the database after the window has been drawn
+        self.root.after_idle(self.load_index)
 
         # Check for first-run setup
         if not config.is_configured():
             self.root.after(100, self.show_first_run_setup)
 
+    def load_index(self):
+        """Initialize the database and show what's indexed."""
+        database.init_db()
+        self.update_status()
+        self.load_folders()
+
+    def check_tesseract(self):
+        """Check for Tesseract on a background thread and warn if missing."""
+        def run_check():
+            # OCR modules are only imported once needed, keeping startup fast
+            import ocr_engine
+
+            if not ocr_engine.is_tesseract_available():
+                self.root.after(0, self.show_tesseract_warning)
+
+        threading.Thread(target=run_check, daemon=True).start()
+
+    def show_tesseract_warning(self):
+        messagebox.showwarning(
+            "Tesseract Not Found",
+            "Tesseract OCR is not installed or not in PATH.\n\n"
+            "Please install from:\n"
+            "https://github.com/UB-Mannheim/tesseract/wiki\n\n"
+            "The app will still work for searching already-indexed screenshots."
+        )
+
     def setup_ui(self):
         # Top frame - search and controls
         top_frame = ttk.Frame(self.root, padding="10")
@@ -114,6 +351,7 @@ class ScreenshotSearchApp:
         self.search_entry = ttk.Entry(top_frame, textvariable=self.search_var, width=30)
         self.search_entry.pack(side=tk.LEFT, padx=(5, 10))
         self.search_entry.bind('<Return>', lambda e: self.do_search())
+        self.search_var.trace_add('write', self.on_search_changed)
 
         # Search button
         self.search_btn = ttk.Button(top_frame, text="Search", command=self.do_search)
@@ -166,10 +404,21 @@ class ScreenshotSearchApp:
         )
 
         # Build layout based on setting
-        if self.layout == "side_panel":
-            self.setup_side_panel_layout()
-        else:
-            self.setup_popup_layout()
+        self.show_layout()
+
+    def show_layout(self):
+        """Show the current layout, building its widgets the first time."""
+        if self.layout not in self.layout_frames:
+            if self.layout == "side_panel":
+                self.setup_side_panel_layout()
+            else:
+                self.setup_popup_layout()
+            return
+
+        self.main_content, results_container = self.layout_frames[self.layout]
+        self.main_content.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self.setup_results_canvas(results_container)
+        self.clear_preview()
 
     def setup_popup_layout(self):
         """Simple layout - just results grid, click opens popup."""
@@ -178,24 +427,46 @@ class ScreenshotSearchApp:
 
         # Store reference for layout switching
         self.main_content = results_container
+        self.layout_frames["popup"] = (results_container, results_container)
 
-        # Canvas for scrollable results
-        self.canvas = tk.Canvas(results_container)
-        scrollbar = ttk.Scrollbar(results_container, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.setup_results_canvas(results_container)
 
-        self.results_frame = ttk.Frame(self.canvas)
+    def setup_results_canvas(self, results_container):
+        """Show the results canvas in a layout's container, creating it once."""
+        if not hasattr(self, 'canvas'):
+            self.create_results_canvas()
 
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        # The canvas belongs to the root window so it survives layout switches;
+        # it is packed into each layout's container and raised above it
+        self.scrollbar.pack(in_=results_container, side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(in_=results_container, side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.lift()
+        self.canvas.lift()
 
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    def create_results_canvas(self):
+        """Create the scrollable canvas the results grid is drawn on."""
+        self.canvas = tk.Canvas(self.root)
+        self.scrollbar = ttk.Scrollbar(self.root, orient=tk.VERTICAL, command=self.canvas.yview)
 
-        self.canvas_window = self.canvas.create_window((0, 0), window=self.results_frame, anchor=tk.NW)
+        self.canvas.configure(yscrollcommand=self.on_canvas_scroll)
 
         # Bind events for scrolling
-        self.results_frame.bind('<Configure>', self.on_frame_configure)
         self.canvas.bind('<Configure>', self.on_canvas_configure)
-        self.canvas.bind_all('<MouseWheel>', self.on_mousewheel)
+
+        # Only route the wheel to the results while the pointer is over them
+        self.canvas.bind('<Enter>', lambda e: self.canvas.bind_all('<MouseWheel>', self.on_mousewheel))
+        self.canvas.bind('<Leave>', lambda e: self.canvas.unbind_all('<MouseWheel>'))
+
+        # X11 reports the wheel as buttons 4/5, sent to the widget under the pointer
+        self.canvas.bind('<Button-4>', lambda e: self.canvas.yview_scroll(-1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.canvas.yview_scroll(1, 'units'))
+
+        # Tag bindings apply to every thumbnail item, including ones drawn later.
+        # Click shows preview (popup or side panel based on layout)
+        self.canvas.tag_bind('thumb', '<Button-1>', self.on_result_click)
+        self.canvas.tag_bind('thumb', '<Double-Button-1>', self.on_result_double_click)
+        self.canvas.tag_bind('thumb', '<Enter>', lambda e: self.canvas.configure(cursor='hand2'))
+        self.canvas.tag_bind('thumb', '<Leave>', lambda e: self.canvas.configure(cursor=''))
 
     def setup_side_panel_layout(self):
         """Split layout with results on left, preview on right."""
@@ -208,24 +479,9 @@ class ScreenshotSearchApp:
         # Left side - Results grid
         results_container = ttk.Frame(main_pane)
         main_pane.add(results_container, weight=2)
+        self.layout_frames["side_panel"] = (main_pane, results_container)
 
-        # Canvas for scrollable results
-        self.canvas = tk.Canvas(results_container)
-        scrollbar = ttk.Scrollbar(results_container, orient=tk.VERTICAL, command=self.canvas.yview)
-
-        self.results_frame = ttk.Frame(self.canvas)
-
-        self.canvas.configure(yscrollcommand=scrollbar.set)
-
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        self.canvas_window = self.canvas.create_window((0, 0), window=self.results_frame, anchor=tk.NW)
-
-        # Bind events for scrolling
-        self.results_frame.bind('<Configure>', self.on_frame_configure)
-        self.canvas.bind('<Configure>', self.on_canvas_configure)
-        self.canvas.bind_all('<MouseWheel>', self.on_mousewheel)
+        self.setup_results_canvas(results_container)
 
         # Right side - Preview pane
         preview_container = ttk.LabelFrame(main_pane, text="Preview", padding="10")
@@ -264,14 +520,13 @@ class ScreenshotSearchApp:
         if new_layout == self.layout:
             return
 
-        # Clear results and references
-        self.thumbnail_refs.clear()
+        # The results canvas moves to the new layout; the preview starts empty
         self.preview_image_ref = None
         self.selected_result = None
 
-        # Destroy current main content
+        # Hide current main content; it's shown again on switching back
         if self.main_content:
-            self.main_content.destroy()
+            self.main_content.pack_forget()
 
         # Update layout
         self.layout = new_layout
@@ -285,146 +540,51 @@ class ScreenshotSearchApp:
             self.root.geometry("800x600")
             self.root.minsize(600, 400)
 
-        # Build new layout
-        if self.layout == "side_panel":
-            self.setup_side_panel_layout()
-        else:
-            self.setup_popup_layout()
+        # Show new layout
+        self.show_layout()
 
         # Reapply theme to new widgets
         self.apply_theme()
 
+        # The layouts have different column counts; existing cells are moved
+        if self.results:
+            self.display_results(self.results)
+
         self.status_var.set(f"Layout changed to {new_layout.replace('_', ' ')}")
 
     def apply_theme(self):
         """Apply the current theme to all widgets."""
         colors = THEMES[self.theme]
 
-        # Configure ttk styles
+        # Each theme is compiled into a ttk theme the first time it's used;
+        # after that switching is a single theme_use() call. Re-selecting the
+        # current theme (e.g. on a layout switch) would restyle every widget.
         style = ttk.Style()
-
-        # Use clam as base - it's the most customizable
-        style.theme_use('clam')
-
-        # Configure all widget styles
-        style.configure(".",
-                        background=colors["bg"],
-                        foreground=colors["fg"],
-                        fieldbackground=colors["entry_bg"],
-                        troughcolor=colors["entry_bg"],
-                        borderwidth=1)
-
-        style.configure("TFrame", background=colors["bg"])
-        style.configure("TLabel", background=colors["bg"], foreground=colors["fg"])
-
-        # Buttons with better styling
-        style.configure("TButton",
-                        background=colors["button_bg"],
-                        foreground=colors["fg"],
-                        bordercolor=colors["border"],
-                        lightcolor=colors["button_bg"],
-                        darkcolor=colors["button_bg"],
-                        padding=(10, 5),
-                        borderwidth=1,
-                        focuscolor=colors["highlight"])
-        style.map("TButton",
-                  background=[("active", colors["highlight"]),
-                              ("pressed", colors["highlight"]),
-                              ("disabled", colors["bg"])],
-                  foreground=[("active", "#ffffff"),
-                              ("disabled", "#666666")],
-                  bordercolor=[("active", colors["highlight"])])
-
-        # Entry fields
-        style.configure("TEntry",
-                        fieldbackground=colors["entry_bg"],
-                        foreground=colors["entry_fg"],
-                        insertcolor=colors["fg"],
-                        bordercolor=colors["border"],
-                        lightcolor=colors["border"],
-                        darkcolor=colors["border"],
-                        borderwidth=1,
-                        padding=5)
-
-        # Combobox
-        style.configure("TCombobox",
-                        fieldbackground=colors["entry_bg"],
-                        foreground=colors["entry_fg"],
-                        background=colors["button_bg"],
-                        arrowcolor=colors["fg"],
-                        bordercolor=colors["border"],
-                        lightcolor=colors["border"],
-                        darkcolor=colors["border"],
-                        borderwidth=1,
-                        padding=5)
-        style.map("TCombobox",
-                  fieldbackground=[("readonly", colors["entry_bg"]),
-                                   ("disabled", colors["bg"])],
-                  foreground=[("readonly", colors["entry_fg"])],
-                  background=[("readonly", colors["button_bg"])])
-
-        # Radiobutton
-        style.configure("TRadiobutton",
-                        background=colors["bg"],
-                        foreground=colors["fg"],
-                        indicatorbackground=colors["entry_bg"],
-                        indicatorforeground=colors["highlight"])
-        style.map("TRadiobutton",
-                  background=[("active", colors["bg"])],
-                  indicatorbackground=[("selected", colors["highlight"])])
-
-        # LabelFrame
-        style.configure("TLabelframe",
-                        background=colors["bg"],
-                        foreground=colors["fg"],
-                        bordercolor=colors["border"],
-                        lightcolor=colors["border"],
-                        darkcolor=colors["border"])
-        style.configure("TLabelframe.Label",
-                        background=colors["bg"],
-                        foreground=colors["fg"])
-
-        # Scrollbar
-        style.configure("Vertical.TScrollbar",
-                        background=colors["button_bg"],
-                        troughcolor=colors["entry_bg"],
-                        bordercolor=colors["border"],
-                        arrowcolor=colors["fg"],
-                        lightcolor=colors["button_bg"],
-                        darkcolor=colors["button_bg"])
-        style.map("Vertical.TScrollbar",
-                  background=[("active", colors["highlight"]),
-                              ("pressed", colors["highlight"])])
-
-        # Progress bar
-        style.configure("Horizontal.TProgressbar",
-                        background=colors["highlight"],
-                        troughcolor=colors["entry_bg"],
-                        bordercolor=colors["bg"],
-                        lightcolor=colors["highlight"],
-                        darkcolor=colors["highlight"])
-
-        # PanedWindow
-        style.configure("TPanedwindow", background=colors["bg"])
-
-        # Configure root window
-        self.root.configure(bg=colors["bg"])
+        theme_name = f"app_{self.theme}"
+        if style.theme_use() != theme_name:
+            if theme_name not in style.theme_names():
+                # Based on clam - it's the most customizable
+                style.theme_create(theme_name, parent='clam', settings=theme_settings(colors))
+            style.theme_use(theme_name)
+
+        # Configure root window (and the settings dialog, which is kept)
+        self.root.configure(bg=colors.bg)
+        if self.settings_window and self.settings_window.winfo_exists():
+            self.settings_window.configure(bg=colors.bg)
 
         # Configure canvas if it exists
         if hasattr(self, 'canvas'):
-            self.canvas.configure(bg=colors["canvas_bg"], highlightthickness=0)
+            self.canvas.configure(bg=colors.canvas_bg, highlightthickness=0)
+            self.canvas.itemconfigure('text', fill=colors.fg)
 
         # Configure text widgets if they exist (side panel layout)
         if hasattr(self, 'text_preview') and self.text_preview.winfo_exists():
             self.text_preview.configure(
-                bg=colors["text_bg"],
-                fg=colors["text_fg"],
-                insertbackground=colors["fg"]
+                bg=colors.text_bg,
+                fg=colors.text_fg,
+                insertbackground=colors.fg
             )
 
-        # Force update of all widgets
-        self.root.update_idletasks()
-
     def switch_theme(self, new_theme):
         """Switch theme dynamically."""
         if new_theme == self.theme:
@@ -434,11 +594,6 @@ class ScreenshotSearchApp:
         config.set_theme(new_theme)
         self.apply_theme()
 
-        # Reopen settings dialog if it was open (to refresh its appearance)
-        if self.settings_window and self.settings_window.winfo_exists():
-            self.settings_window.destroy()
-            self.root.after(50, self.show_settings)
-
         self.status_var.set(f"Theme changed to {new_theme}")
 
     def load_folders(self):
@@ -446,14 +601,20 @@ class ScreenshotSearchApp:
         folders = database.get_folders()
         self.folder_filter['values'] = folders
 
-    def on_frame_configure(self, event):
-        self.canvas.configure(scrollregion=self.canvas.bbox('all'))
-
     def on_canvas_configure(self, event):
-        self.canvas.itemconfig(self.canvas_window, width=event.width)
+        self.schedule_render()
+
+    def on_canvas_scroll(self, first, last):
+        """Keep the scrollbar in sync and build any rows scrolled into view."""
+        self.scrollbar.set(first, last)
+        self.schedule_render()
 
     def on_mousewheel(self, event):
-        self.canvas.yview_scroll(int(-1 * (event.delta / 120)), 'units')
+        # Windows reports multiples of 120 per notch; macOS reports small unit deltas
+        if sys.platform == 'darwin':
+            self.canvas.yview_scroll(-event.delta, 'units')
+        else:
+            self.canvas.yview_scroll(int(-1 * (event.delta / 120)), 'units')
 
     def update_status(self):
         stats = database.get_stats()
@@ -475,29 +636,78 @@ class ScreenshotSearchApp:
         }
         return mapping.get(self.date_filter_var.get())
 
+    def on_search_changed(self, *args):
+        """Search as the user types, once they pause for SEARCH_DEBOUNCE_MS."""
+        if self.pending_search:
+            self.root.after_cancel(self.pending_search)
+        self.pending_search = self.root.after(SEARCH_DEBOUNCE_MS, self.search_as_you_type)
+
+    def search_as_you_type(self):
+        self.pending_search = None
+        if self.search_var.get().strip():
+            self.do_search()
+
     def do_search(self):
+        if self.pending_search:
+            self.root.after_cancel(self.pending_search)
+            self.pending_search = None
+
         query = self.search_var.get().strip()
         if not query:
             messagebox.showinfo("Search", "Please enter a search term")
             return
 
-        # Clear previous results
-        self.clear_results()
-        if self.layout == "side_panel":
-            self.clear_preview()
-
         # Get filter values
         date_filter = self.get_date_filter_value()
         folder_filter = self.folder_filter_var.get()
+        if folder_filter == "All Folders":
+            folder_filter = None
+
+        self.search_seq += 1
+        self.status_var.set(f"Searching for '{query}'...")
+        self.search_queue.put((self.search_seq, query, date_filter, folder_filter))
+
+    def search_worker(self):
+        """Run queued searches in the background and post results to the UI."""
+        while True:
+            request = self.search_queue.get()
+
+            # Only the newest request matters; drop any that piled up behind it
+            while True:
+                try:
+                    request = self.search_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            seq, query, date_filter, folder_filter = request
+            try:
+                # Search database with filters
+                results = database.search(
+                    query,
+                    date_filter=date_filter,
+                    folder_filter=folder_filter
+                )
+            except Exception as e:
+                self.root.after(0, self.show_search_error, seq, str(e))
+                continue
+
+            self.root.after(0, self.show_search_results, seq, query, results)
+
+    def show_search_error(self, seq, error):
+        if seq == self.search_seq:
+            self.status_var.set(f"Search failed: {error}")
+
+    def show_search_results(self, seq, query, results):
+        """Replace the current results with a finished search (Tk thread)."""
+        if seq != self.search_seq:
+            # A newer search was started while this one ran
+            return
 
-        # Search database with filters
-        results = database.search(
-            query,
-            date_filter=date_filter,
-            folder_filter=folder_filter if folder_filter != "All Folders" else None
-        )
+        if self.layout == "side_panel":
+            self.clear_preview()
 
         if not results:
+            self.clear_results()
             self.status_var.set(f"No results for '{query}'")
             return
 
@@ -505,9 +715,19 @@ class ScreenshotSearchApp:
         self.display_results(results)
 
     def clear_results(self):
-        for widget in self.results_frame.winfo_children():
-            widget.destroy()
-        self.thumbnail_refs.clear()
+        self.canvas.delete('result')
+        self.canvas.configure(scrollregion=(0, 0, 0, 0))
+        self.results = []
+        self.rendered_results.clear()
+        self.result_rows = 0
+        self.result_items.clear()
+        self.result_cells.clear()
+        self.reusable_cells.clear()
+
+        # Abandon thumbnails that haven't started decoding yet
+        for future in self.thumb_futures.values():
+            future.cancel()
+        self.thumb_futures.clear()
 
     def clear_preview(self):
         """Clear the side panel preview (only used in side_panel layout)."""
@@ -523,60 +743,204 @@ class ScreenshotSearchApp:
         self.open_btn.configure(state=tk.DISABLED)
         self.folder_btn.configure(state=tk.DISABLED)
 
+    def get_columns(self):
+        return COLUMNS if self.layout == "popup" else 3
+
     def display_results(self, results):
-        row = 0
-        col = 0
-        columns = COLUMNS if self.layout == "popup" else 3
-
-        for result in results:
-            file_path = result['file_path']
-            snippet = result['snippet']
-
-            # Create frame for each result
-            item_frame = ttk.Frame(self.results_frame, padding="5")
-            item_frame.grid(row=row, column=col, padx=5, pady=5, sticky=tk.N)
-
-            # Create thumbnail
-            thumbnail = self.create_thumbnail(file_path)
-            if thumbnail:
-                self.thumbnail_refs.append(thumbnail)
-                thumb_label = ttk.Label(item_frame, image=thumbnail, cursor="hand2")
-                thumb_label.pack()
-                # Click shows preview (popup or side panel based on layout)
-                thumb_label.bind('<Button-1>', lambda e, r=result: self.show_preview(r))
-                thumb_label.bind('<Double-Button-1>', lambda e, p=file_path: self.open_image(p))
-            else:
-                ttk.Label(item_frame, text="[No preview]").pack()
+        """Size the results grid; cells are drawn as they scroll into view."""
+        # Cells already drawn for the previous results can be reused by path
+        self.reusable_cells = self.result_cells
+        self.result_cells = {}
+        self.result_items.clear()
+        self.rendered_results.clear()
+
+        self.results = results
+        columns = self.get_columns()
+        self.result_rows = -(-len(results) // columns)
+
+        # Cover the full grid so the scrollbar reflects every result
+        self.canvas.configure(scrollregion=(0, 0, columns * CELL_WIDTH, self.result_rows * ROW_HEIGHT))
+
+        self.canvas.yview_moveto(0)
+        self.render_visible_results()
+
+        # Anything not reused by the first render pass is gone from the results
+        for file_path in list(self.reusable_cells):
+            self.discard_cell(self.reusable_cells, file_path)
+
+    def schedule_render(self):
+        """Coalesce scroll/resize events into one render pass."""
+        if not self.render_pending and self.results:
+            self.render_pending = True
+            self.root.after_idle(self.render_visible_results)
+
+    def render_visible_results(self):
+        """Draw the rows inside the viewport and drop rows far outside it."""
+        self.render_pending = False
+        if not self.results:
+            return
 
-            # Truncate snippet for display
-            display_snippet = snippet[:MAX_SNIPPET_LENGTH]
-            if len(snippet) > MAX_SNIPPET_LENGTH:
-                display_snippet += "..."
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(max(self.canvas.winfo_height(), ROW_HEIGHT))
+        columns = self.get_columns()
 
-            # Replace highlight markers
-            display_snippet = display_snippet.replace('>>>', '[').replace('<<<', ']')
+        # One extra row below the viewport so scrolling doesn't show gaps
+        first_row = int(top // ROW_HEIGHT)
+        last_row = min(int(bottom // ROW_HEIGHT) + 1, self.result_rows - 1)
 
-            snippet_label = ttk.Label(
-                item_frame,
+        # Rows a little way off-screen are kept so small scrolls don't redraw
+        keep = range(max(first_row - 2, 0) * columns, (last_row + 3) * columns)
+        for index in [i for i in self.rendered_results if i not in keep]:
+            self.release_result(index)
+
+        for index in range(first_row * columns, min((last_row + 1) * columns, len(self.results))):
+            if index not in self.rendered_results:
+                self.rendered_results.add(index)
+                self.render_result(index, columns)
+
+    def render_result(self, index, columns):
+        """Draw (or move into place) the thumbnail and snippet items for one result."""
+        result = self.results[index]
+        file_path = result['file_path']
+        snippet = result['snippet']
+        row, col = divmod(index, columns)
+
+        center_x = col * CELL_WIDTH + CELL_WIDTH // 2
+        top = row * ROW_HEIGHT + CELL_PADDING
+
+        # Truncate snippet for display
+        display_snippet = snippet[:MAX_SNIPPET_LENGTH]
+        if len(snippet) > MAX_SNIPPET_LENGTH:
+            display_snippet += "..."
+
+        cell = reused = self.reusable_cells.pop(file_path, None)
+        if cell:
+            # Same screenshot as in the previous results: keep its thumbnail
+            image_item, status_item, snippet_item = cell
+            self.canvas.coords(image_item, center_x, top)
+            self.canvas.coords(status_item, center_x, top + THUMBNAIL_SIZE[1] // 2)
+            self.canvas.coords(snippet_item, center_x, top + THUMBNAIL_SIZE[1] + 5)
+            self.canvas.itemconfigure(snippet_item, text=display_snippet)
+            if file_path in self.thumbnail_refs:
+                self.thumbnail_refs.move_to_end(file_path)
+        else:
+            fill = THEMES[self.theme].fg
+
+            # Thumbnail is filled in once the worker thread has decoded it
+            image_item = self.canvas.create_image(center_x, top, anchor=tk.N, tags=('result', 'thumb'))
+            status_item = self.canvas.create_text(
+                center_x, top + THUMBNAIL_SIZE[1] // 2,
+                text="Loading...", fill=fill, tags=('result', 'thumb', 'text')
+            )
+            snippet_item = self.canvas.create_text(
+                center_x, top + THUMBNAIL_SIZE[1] + 5,
                 text=display_snippet,
-                wraplength=THUMBNAIL_SIZE[0],
-                justify=tk.CENTER
+                width=THUMBNAIL_SIZE[0],
+                justify=tk.CENTER,
+                anchor=tk.N,
+                fill=fill,
+                tags=('result', 'text')
             )
-            snippet_label.pack(pady=(5, 0))
+            cell = (image_item, status_item, snippet_item)
+
+        self.result_items[image_item] = index
+        self.result_items[status_item] = index
+        self.result_cells[file_path] = cell
+
+        # After the cell is registered, so a cached thumbnail has somewhere to go
+        if reused is None:
+            self.request_thumbnail(file_path)
+
+    def release_result(self, index):
+        """Delete a result's canvas items and free its thumbnail."""
+        self.rendered_results.discard(index)
+        file_path = self.results[index]['file_path']
+        for item in self.result_cells.get(file_path, ()):
+            self.result_items.pop(item, None)
+        self.discard_cell(self.result_cells, file_path)
+
+    def discard_cell(self, cells, file_path):
+        """Remove one path's cell from cells and stop loading its thumbnail."""
+        for item in cells.pop(file_path, ()):
+            self.canvas.delete(item)
+
+        future = self.thumb_futures.pop(file_path, None)
+        if future is not None:
+            future.cancel()
+
+    def on_result_click(self, event):
+        index = self.result_items.get(self.canvas.find_withtag('current')[0])
+        if index is not None:
+            self.show_preview(self.results[index])
+
+    def on_result_double_click(self, event):
+        index = self.result_items.get(self.canvas.find_withtag('current')[0])
+        if index is not None:
+            self.open_image(self.results[index]['file_path'])
+
+    def request_thumbnail(self, file_path: str):
+        """Decode a thumbnail in the background, or reuse one already made."""
+        if file_path in self.thumbnail_refs:
+            self.thumbnail_refs.move_to_end(file_path)
+            self.install_thumbnail(file_path, None)
+            return
+        if file_path in self.thumb_futures:
+            return
 
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
+        future = self.thumb_executor.submit(self.create_thumbnail, file_path)
+        self.thumb_futures[file_path] = future
+        future.add_done_callback(lambda f, p=file_path: self.on_thumbnail_done(p, f))
+
+    def on_thumbnail_done(self, file_path: str, future):
+        """Hand a finished thumbnail to the Tk thread (runs on a worker thread)."""
+        # PhotoImage is a Tk object, so the worker only gets as far as PPM bytes
+        if not future.cancelled():
+            self.root.after(0, self.install_thumbnail, file_path, future.result(), future)
+
+    def install_thumbnail(self, file_path: str, ppm_data, future=None):
+        """Show a decoded thumbnail in its grid cell (runs on the Tk thread)."""
+        if future is not None:
+            if self.thumb_futures.get(file_path) is not future:
+                # Finished after a new search replaced the results
+                return
+            del self.thumb_futures[file_path]
+
+        cell = self.result_cells.get(file_path)
+        if cell is None:
+            # Scrolled away or cleared while decoding
+            return
+        image_item, status_item, _ = cell
+
+        thumbnail = self.thumbnail_refs.get(file_path)
+        if thumbnail is None and ppm_data is not None:
+            # Tk parses PPM natively in one call, unlike ImageTk's pixel copy
+            thumbnail = tk.PhotoImage(data=ppm_data)
+            self.thumbnail_refs[file_path] = thumbnail
+            # On-screen thumbnails were all used recently, so only ones
+            # scrolled away long ago are dropped
+            while len(self.thumbnail_refs) > MAX_CACHED_PHOTOS:
+                self.thumbnail_refs.popitem(last=False)
+
+        if thumbnail:
+            self.canvas.itemconfigure(image_item, image=thumbnail)
+            self.canvas.itemconfigure(status_item, text='')
+        else:
+            self.canvas.itemconfigure(status_item, text="[No preview]")
+            self.canvas.dtag(status_item, 'thumb')
 
     def create_thumbnail(self, file_path: str):
+        """Load a thumbnail and encode it as PPM bytes (runs on a worker thread)."""
         try:
             if not Path(file_path).exists():
                 return None
 
-            image = Image.open(file_path)
-            image.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-            return ImageTk.PhotoImage(image)
+            image = thumbnails.get_thumbnail(file_path, THUMBNAIL_SIZE)
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+
+            buffer = io.BytesIO()
+            image.save(buffer, format='PPM')
+            return buffer.getvalue()
         except Exception as e:
             print(f"Failed to create thumbnail for {file_path}: {e}")
             return None
@@ -598,7 +962,7 @@ class ScreenshotSearchApp:
         popup.title("Screenshot Preview")
         popup.geometry("600x700")
         popup.transient(self.root)
-        popup.configure(bg=colors["bg"])
+        popup.configure(bg=colors.bg)
 
         # Main frame with padding
         main_frame = ttk.Frame(popup, padding="10")
@@ -610,8 +974,7 @@ class ScreenshotSearchApp:
 
         try:
             if Path(file_path).exists():
-                image = Image.open(file_path)
-                image.thumbnail(PREVIEW_SIZE, Image.Resampling.LANCZOS)
+                image = thumbnails.get_preview(file_path, PREVIEW_SIZE)
                 photo = ImageTk.PhotoImage(image)
                 image_label = ttk.Label(image_frame, image=photo)
                 image_label.image = photo  # Keep reference
@@ -625,8 +988,9 @@ class ScreenshotSearchApp:
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(fill=tk.X, pady=(10, 5))
 
+        text = self.get_result_text(result)
+
         def copy_text():
-            text = result.get('extracted_text', '') or database.get_screenshot_text(file_path)
             if text:
                 self.root.clipboard_clear()
                 self.root.clipboard_append(text)
@@ -636,7 +1000,7 @@ class ScreenshotSearchApp:
 
         ttk.Button(btn_frame, text="Copy Text", command=copy_text).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(btn_frame, text="Open Image", command=lambda: self.open_image(file_path)).pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Button(btn_frame, text="Open Folder", command=lambda: os.startfile(Path(file_path).parent)).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(btn_frame, text="Open Folder", command=lambda: open_with_system(os.path.dirname(file_path))).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(btn_frame, text="Close", command=popup.destroy).pack(side=tk.RIGHT)
 
         # Text preview
@@ -647,9 +1011,9 @@ class ScreenshotSearchApp:
             text_frame,
             wrap=tk.WORD,
             height=6,
-            bg=colors["text_bg"],
-            fg=colors["text_fg"],
-            insertbackground=colors["fg"]
+            bg=colors.text_bg,
+            fg=colors.text_fg,
+            insertbackground=colors.fg
         )
         text_scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=text_widget.yview)
         text_widget.configure(yscrollcommand=text_scrollbar.set)
@@ -658,7 +1022,6 @@ class ScreenshotSearchApp:
         text_widget.pack(fill=tk.BOTH, expand=True)
 
         # Insert text
-        text = result.get('extracted_text', '') or database.get_screenshot_text(file_path)
         text_widget.insert('1.0', text if text else "(No text extracted)")
         text_widget.configure(state=tk.DISABLED)
 
@@ -679,8 +1042,7 @@ class ScreenshotSearchApp:
         # Load and display preview image
         try:
             if Path(file_path).exists():
-                image = Image.open(file_path)
-                image.thumbnail((400, 400), Image.Resampling.LANCZOS)
+                image = thumbnails.get_preview(file_path, (400, 400))
                 self.preview_image_ref = ImageTk.PhotoImage(image)
                 self.preview_label.configure(image=self.preview_image_ref, text='')
             else:
@@ -689,19 +1051,25 @@ class ScreenshotSearchApp:
             self.preview_label.configure(image='', text=f"Error: {e}")
 
         # Display extracted text
-        text = result.get('extracted_text', '') or database.get_screenshot_text(file_path)
+        text = self.get_result_text(result)
         self.text_preview.configure(state=tk.NORMAL)
         self.text_preview.delete('1.0', tk.END)
         self.text_preview.insert('1.0', text if text else "(No text extracted)")
         self.text_preview.configure(state=tk.DISABLED)
 
+    def get_result_text(self, result):
+        """Get a result's extracted text, looking it up once and keeping it on the result."""
+        if 'extracted_text' not in result:
+            result['extracted_text'] = database.get_screenshot_text(result['file_path'])
+        return result['extracted_text']
+
     def copy_text(self):
         """Copy extracted text to clipboard (side panel layout)."""
         if not self.selected_result:
             return
 
-        text = self.text_preview.get('1.0', tk.END).strip()
-        if text and text != "(No text extracted)":
+        text = self.get_result_text(self.selected_result)
+        if text:
             self.root.clipboard_clear()
             self.root.clipboard_append(text)
             self.status_var.set("Text copied to clipboard!")
@@ -716,20 +1084,20 @@ class ScreenshotSearchApp:
     def open_folder(self):
         """Open the folder containing the selected image (side panel layout)."""
         if self.selected_result:
-            file_path = Path(self.selected_result['file_path'])
-            if file_path.exists():
-                os.startfile(file_path.parent)
+            file_path = self.selected_result['file_path']
+            if os.path.exists(file_path):
+                open_with_system(os.path.dirname(file_path))
             else:
                 messagebox.showerror("Error", "File not found")
 
     def open_image(self, file_path: str):
         """Open image in default system viewer."""
-        if Path(file_path).exists():
-            os.startfile(file_path)
+        if os.path.exists(file_path):
+            open_with_system(file_path)
         else:
             messagebox.showerror("Error", f"File not found:\n{file_path}")
 
-    def start_scan(self):
+    def start_scan(self, full_rescan=False):
         if self.is_scanning:
             return
 
@@ -745,21 +1113,59 @@ class ScreenshotSearchApp:
         self.progress_bar.pack(side=tk.LEFT, padx=(10, 0))
         self.progress_var.set(0)
 
-        # Run scan in background thread
-        thread = threading.Thread(target=self.run_scan, daemon=True)
-        thread.start()
+        # Run scan on the background worker
+        self.scan_requests.put(full_rescan)
+
+    def on_close(self):
+        """Stop any running scan, then close the app."""
+        self.scan_stop.set()
+        self.root.destroy()
+
+    def scan_worker(self):
+        """Run requested scans one at a time in the background."""
+        while True:
+            full_rescan = self.scan_requests.get()
+            self.run_scan(full_rescan)
 
-    def run_scan(self):
+    def run_scan(self, full_rescan=False):
         def progress_callback(current, total, filename):
-            progress = (current / total) * 100
-            self.root.after(0, lambda: self.progress_var.set(progress))
-            self.root.after(0, lambda: self.status_var.set(f"Scanning: {filename} ({current}/{total})"))
+            self.scan_progress = (current, total, filename)
+            if not self.progress_update_pending:
+                self.progress_update_pending = True
+                self.root.after(PROGRESS_UPDATE_MS, self.show_scan_progress)
 
         try:
-            stats = scanner.scan_and_index(progress_callback=progress_callback)
-            self.root.after(0, lambda: self.scan_complete(stats))
+            import scanner
+
+            stats = scanner.scan_and_index(
+                progress_callback=progress_callback,
+                thumb_callback=self.persist_thumbnail,
+                full_rescan=full_rescan,
+                stop_event=self.scan_stop
+            )
+            if not self.scan_stop.is_set():
+                self.root.after(0, lambda: self.scan_complete(stats))
         except Exception as e:
-            self.root.after(0, lambda: self.scan_error(str(e)))
+            if not self.scan_stop.is_set():
+                self.root.after(0, lambda: self.scan_error(str(e)))
+
+    def show_scan_progress(self):
+        """Show the scan thread's latest progress (runs on the Tk thread)."""
+        # Cleared before reading so a newer value always schedules another update
+        self.progress_update_pending = False
+        if not self.is_scanning:
+            return
+
+        current, total, filename = self.scan_progress
+        self.progress_var.set((current / total) * 100)
+        self.status_var.set(f"Scanning: {filename} ({current}/{total})")
+
+    def persist_thumbnail(self, file_path: str, image):
+        """Cache a thumbnail from an image the scanner opened (runs on a scanner thread)."""
+        try:
+            thumbnails.cache_thumbnail(file_path, image, THUMBNAIL_SIZE)
+        except Exception as e:
+            print(f"Failed to cache thumbnail for {file_path}: {e}")
 
     def scan_complete(self, stats):
         self.is_scanning = False
@@ -774,6 +1180,7 @@ class ScreenshotSearchApp:
         )
         messagebox.showinfo("Scan Complete", message)
         self.update_status()
+        database.clear_folders_cache()
         self.load_folders()
 
     def scan_error(self, error: str):
@@ -795,19 +1202,37 @@ class ScreenshotSearchApp:
 
     def show_settings(self):
         """Show settings dialog."""
-        # Close existing settings window if open
-        if self.settings_window and self.settings_window.winfo_exists():
-            self.settings_window.destroy()
+        # Built once, then hidden and shown again, so reopening doesn't
+        # construct every widget from scratch
+        if self.settings_window is None or not self.settings_window.winfo_exists():
+            self.build_settings_window()
+
+        # Bring the controls up to date with changes made elsewhere
+        self.folder_path_var.set(config.get_screenshots_folder() or "(Not set)")
+        self.settings_layout_var.set(self.layout)
+        self.settings_theme_var.set(self.theme)
+
+        self.settings_window.deiconify()
+        self.settings_window.lift()
+        self.settings_window.grab_set()
+
+    def hide_settings(self):
+        """Hide the settings dialog, keeping it for next time."""
+        self.settings_window.grab_release()
+        self.settings_window.withdraw()
 
+    def build_settings_window(self):
+        """Create the (initially hidden) settings dialog and its controls."""
         colors = THEMES[self.theme]
 
         self.settings_window = tk.Toplevel(self.root)
+        self.settings_window.withdraw()
         self.settings_window.title("Settings")
         self.settings_window.geometry("500x280")
         self.settings_window.resizable(False, False)
         self.settings_window.transient(self.root)
-        self.settings_window.grab_set()
-        self.settings_window.configure(bg=colors["bg"])
+        self.settings_window.configure(bg=colors.bg)
+        self.settings_window.protocol("WM_DELETE_WINDOW", self.hide_settings)
 
         settings_window = self.settings_window  # Local reference for nested functions
 
@@ -815,8 +1240,9 @@ class ScreenshotSearchApp:
         folder_frame = ttk.LabelFrame(settings_window, text="Screenshots Folder", padding="10")
         folder_frame.pack(fill=tk.X, padx=10, pady=10)
 
-        current_folder = config.get_screenshots_folder() or "(Not set)"
-        folder_path_var = tk.StringVar(value=current_folder)
+        # Also updated by browse_folder()
+        self.folder_path_var = tk.StringVar()
+        folder_path_var = self.folder_path_var
 
         folder_entry = ttk.Entry(folder_frame, textvariable=folder_path_var, width=50, state='readonly')
         folder_entry.pack(side=tk.LEFT, padx=(0, 10))
@@ -839,7 +1265,8 @@ class ScreenshotSearchApp:
         layout_frame = ttk.LabelFrame(settings_window, text="Layout", padding="10")
         layout_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
 
-        layout_var = tk.StringVar(value=self.layout)
+        self.settings_layout_var = tk.StringVar()
+        layout_var = self.settings_layout_var
 
         def on_layout_change():
             new_layout = layout_var.get()
@@ -866,7 +1293,8 @@ class ScreenshotSearchApp:
         theme_frame = ttk.LabelFrame(settings_window, text="Theme", padding="10")
         theme_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
 
-        theme_var = tk.StringVar(value=self.theme)
+        self.settings_theme_var = tk.StringVar()
+        theme_var = self.settings_theme_var
 
         def on_theme_change():
             new_theme = theme_var.get()
@@ -893,7 +1321,14 @@ class ScreenshotSearchApp:
         btn_frame = ttk.Frame(settings_window)
         btn_frame.pack(fill=tk.X, padx=10, pady=10)
 
-        ttk.Button(btn_frame, text="Close", command=settings_window.destroy).pack(side=tk.RIGHT)
+        ttk.Button(btn_frame, text="Close", command=self.hide_settings).pack(side=tk.RIGHT)
+
+        def rescan_all():
+            self.hide_settings()
+            self.start_scan(full_rescan=True)
+
+        # Normal scans skip files older than the last scan; this checks them all
+        ttk.Button(btn_frame, text="Rescan All Files", command=rescan_all).pack(side=tk.LEFT)
 
     def browse_folder(self, parent_window=None):
         """Open folder browser and save selection."""
@@ -916,6 +1351,9 @@ class ScreenshotSearchApp:
 
 
 def main():
+    # Scans OCR in worker processes, which need this in a frozen Windows build
+    multiprocessing.freeze_support()
+
     root = tk.Tk()
     app = ScreenshotSearchApp(root)
     root.mainloop()
@@ -1,6 +1,20 @@
+import functools
+import os
+import queue
+import shutil
+import tempfile
+import threading
+
 import pytesseract
 from PIL import Image
 from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
 
 # Common Tesseract installation paths on Windows
 TESSERACT_PATHS = [
@@ -9,9 +23,33 @@ TESSERACT_PATHS = [
     r"C:\Users\liamd\AppData\Local\Programs\Tesseract-OCR\tesseract.exe",
 ]
 
+# Screenshots both wider and taller than this are halved before OCR (see
+# prepare_image). Width alone isn't enough: two 1080p monitors side by side
+# give a 3840x1080 capture with normal-size text.
+OCR_HALVE_WIDTH = 3000
+OCR_HALVE_HEIGHT = 2000
+
+# Images whose darkest and lightest pixels are closer than this (out of 255)
+# can't hold readable text, so they're indexed with no text and skip OCR
+MIN_TEXT_CONTRAST = 16
+
+# Images decoded ahead of in-process OCR; bounds the memory used per worker
+DECODE_AHEAD = 2
+
+# With tesserocr installed, OCR runs in-process through one libtesseract
+# instance per process (False if it failed to load), instead of starting
+# the tesseract executable for every image. The API isn't thread-safe.
+_api = None
+_api_lock = threading.Lock()
+
 
+@functools.lru_cache(maxsize=1)
 def configure_tesseract():
     """Configure the path to Tesseract executable if not in PATH."""
+    # pytesseract runs plain "tesseract" by default, which is fine on PATH
+    if shutil.which('tesseract'):
+        return True
+
     for path in TESSERACT_PATHS:
         if Path(path).exists():
             pytesseract.pytesseract.tesseract_cmd = path
@@ -19,25 +57,35 @@ def configure_tesseract():
     return False
 
 
-def extract_text(image_path: str) -> str:
+def extract_text(image_path: str, image: Optional[Image.Image] = None) -> str:
     """
     Extract text from an image using Tesseract OCR.
 
     Args:
         image_path: Path to the image file
+        image: The file already opened by the caller, to avoid decoding it twice
 
     Returns:
         Extracted text as a string, or empty string if extraction fails
     """
     try:
-        image = Image.open(image_path)
+        # Greyscale (also handles PNG with transparency), HiDPI shots halved
+        if image is None:
+            image = open_prepared(image_path)
+        else:
+            image = prepare_image(image)
 
-        # Convert to RGB if necessary (handles PNG with transparency)
-        if image.mode in ('RGBA', 'P'):
-            image = image.convert('RGB')
+        if is_blank(image):
+            return ""
 
         # Run OCR
-        text = pytesseract.image_to_string(image)
+        with _api_lock:
+            api = _get_api()
+            if api:
+                api.SetImage(image)
+                text = api.GetUTF8Text()
+            else:
+                text = pytesseract.image_to_string(image)
 
         return text.strip()
 
@@ -46,8 +94,295 @@ def extract_text(image_path: str) -> str:
         return ""
 
 
+def extract_text_batch(image_paths: list[str], batch_size: int = 100, tiled: bool = False) -> list[str]:
+    """
+    Extract text from many images, starting Tesseract once per batch.
+
+    Args:
+        image_paths: Paths to the image files
+        batch_size: Maximum images per Tesseract run
+        tiled: OCR each image as tiles with extract_text_tiled()
+
+    Returns:
+        Extracted text for each image, in the same order
+    """
+    if tiled:
+        # Each image's tiles already make up one Tesseract run
+        return [extract_text_tiled(image_path) for image_path in image_paths]
+
+    with _api_lock:
+        in_process = bool(_get_api())
+    if in_process:
+        # Nothing to start up, so there's nothing to batch
+        return [
+            extract_text(image_path, image) if image is not None else ""
+            for image_path, image in _decode_ahead(image_paths)
+        ]
+
+    texts = []
+    for start in range(0, len(image_paths), batch_size):
+        texts.extend(_extract_text_list(image_paths[start:start + batch_size]))
+    return texts
+
+
+def _decode_ahead(image_paths: list[str]):
+    """
+    Yield (path, prepared image) pairs, decoding on a background thread.
+
+    tesserocr releases the GIL while it works, so the next few images are
+    read and prepared while the current one is OCR'd. The image is None if
+    the file couldn't be opened.
+    """
+    decoded = queue.Queue(maxsize=DECODE_AHEAD)
+    stop = threading.Event()
+
+    def decode():
+        for image_path in image_paths:
+            if stop.is_set():
+                break
+            try:
+                prepared = open_prepared(image_path)
+            except Exception as e:
+                print(f"OCR failed for {image_path}: {e}")
+                prepared = None
+            decoded.put((image_path, prepared))
+        decoded.put(None)
+
+    threading.Thread(target=decode, daemon=True).start()
+
+    finished = False
+    try:
+        while (item := decoded.get()) is not None:
+            yield item
+        finished = True
+    finally:
+        if not finished:
+            # Unblock the decode thread so it sees stop and exits
+            stop.set()
+            while decoded.get() is not None:
+                pass
+
+
+def _extract_text_list(image_paths: list[str]) -> list[str]:
+    """
+    OCR images in one Tesseract run by giving it a file listing their paths.
+
+    If the output doesn't split into one page per image, the images are
+    OCR'd one at a time instead.
+    """
+    texts = [""] * len(image_paths)
+
+    # Indexes of the images that could be opened and might have text
+    listed = []
+
+    def prepared_images():
+        # Yielded one at a time so only one decoded image is held at once
+        for i, image_path in enumerate(image_paths):
+            try:
+                image = open_prepared(image_path)
+            except Exception as e:
+                print(f"OCR failed for {image_path}: {e}")
+                continue
+            if not is_blank(image):
+                listed.append(i)
+                yield image
+
+    pages = _ocr_image_list(prepared_images())
+    if pages is None:
+        for i in listed:
+            texts[i] = extract_text(image_paths[i])
+        return texts
+
+    for i, page in zip(listed, pages):
+        texts[i] = page
+    return texts
+
+
+def _ocr_image_list(images: Iterable[Image.Image]) -> Optional[list[str]]:
+    """
+    OCR prepared images in one Tesseract run, or None if the run failed.
+
+    Each image is written as an uncompressed PGM as soon as it arrives,
+    which costs little more than a memory copy, so a generator of images
+    is never all in memory at once. Tesseract ends each page's text with
+    a form feed.
+    """
+    count = 0
+    with tempfile.TemporaryDirectory() as temp_dir:
+        list_path = os.path.join(temp_dir, "images.txt")
+        with open(list_path, 'w', encoding='utf-8') as list_file:
+            for image in images:
+                image_path = os.path.join(temp_dir, f"{count}.pgm")
+                image.save(image_path)
+                list_file.write(image_path + '\n')
+                count += 1
+
+        if not count:
+            return []
+
+        try:
+            output = pytesseract.image_to_string(list_path)
+        except Exception as e:
+            print(f"Batch OCR failed, retrying images one at a time: {e}")
+            return None
+
+    pages = output.split('\f')
+    if len(pages) != count + 1:
+        return None
+    return [page.strip() for page in pages[:-1]]
+
+
+def extract_text_tiled(image_path: str, tiles: tuple[int, int] = (2, 2), overlap: int = 40) -> str:
+    """
+    Extract text from an image by OCR'ing it as a grid of overlapping tiles.
+
+    Tesseract's layout analysis is tuned for document pages and can miss
+    text on a busy full-screen capture; tiles are closer to what it expects.
+    Tiles overlap so a line cut at a tile edge is whole in its neighbour,
+    which means some words are indexed twice.
+
+    Args:
+        image_path: Path to the image file
+        tiles: Number of (columns, rows) to split the image into
+        overlap: Pixels each tile extends past its edges into its neighbours
+
+    Returns:
+        Text of the tiles in reading order, or empty string if extraction fails
+    """
+    try:
+        image = open_prepared(image_path)
+    except Exception as e:
+        print(f"OCR failed for {image_path}: {e}")
+        return ""
+
+    if is_blank(image):
+        return ""
+
+    columns, rows = tiles
+    tile_width = image.width / columns
+    tile_height = image.height / rows
+    # Row by row, so the text comes out top-to-bottom, left-to-right
+    crops = [
+        image.crop((
+            max(0, round(column * tile_width) - overlap),
+            max(0, round(row * tile_height) - overlap),
+            min(image.width, round((column + 1) * tile_width) + overlap),
+            min(image.height, round((row + 1) * tile_height) + overlap),
+        ))
+        for row in range(rows)
+        for column in range(columns)
+    ]
+
+    with _api_lock:
+        in_process = bool(_get_api())
+    if in_process:
+        pages = [extract_text(image_path, crop) for crop in crops]
+    else:
+        pages = _ocr_image_list(crops)
+        if pages is None:
+            return extract_text(image_path, image)
+
+    return '\n'.join(page for page in pages if page)
+
+
+def prepare_image(image: Image.Image) -> Image.Image:
+    """
+    Convert an image to what Tesseract works on, so it has less to process.
+
+    Tesseract binarizes a greyscale copy internally anyway. Screenshots past
+    both OCR_HALVE_WIDTH and OCR_HALVE_HEIGHT are almost always from HiDPI
+    displays, where text is drawn at 2x, so halving them keeps text at a
+    readable size. Other images aren't shrunk, since small UI text is
+    already near Tesseract's limit.
+
+    Greyscale and bilevel images are used as they are, without a copy.
+    Every other mode goes straight to greyscale; converting RGBA this way
+    drops the alpha channel rather than compositing it over a background.
+    """
+    if image.mode not in ('L', '1'):
+        image = image.convert('L')
+    if image.width > OCR_HALVE_WIDTH and image.height > OCR_HALVE_HEIGHT:
+        image = image.reduce(2)
+    return image
+
+
+def is_blank(image: Image.Image) -> bool:
+    """
+    Check whether a prepared image is too flat to contain text.
+
+    One pass over the pixels in C, which is far cheaper than Tesseract
+    finding nothing on a solid-colour or near-uniform frame.
+    """
+    darkest, lightest = image.getextrema()
+    return lightest - darkest < MIN_TEXT_CONTRAST
+
+
+def open_prepared(image_path: str) -> Image.Image:
+    """
+    Open an image as prepare_image() would leave it.
+
+    With OpenCV installed, the file is decoded straight to greyscale and
+    halved with its SIMD routines, skipping the full-colour copy Pillow
+    makes. Formats OpenCV can't read (e.g. GIF) go through Pillow.
+    """
+    if cv2 is not None:
+        # imdecode rather than imread, which can't open non-ASCII paths on Windows
+        array = cv2.imdecode(np.fromfile(image_path, np.uint8), cv2.IMREAD_GRAYSCALE)
+        if array is not None:
+            if array.shape[1] > OCR_HALVE_WIDTH and array.shape[0] > OCR_HALVE_HEIGHT:
+                array = cv2.resize(array, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+            return Image.fromarray(array)
+
+    image = Image.open(image_path)
+    try:
+        image.load()
+        prepared = prepare_image(image)
+    except Exception:
+        image.close()
+        raise
+    # Greyscale images come back as they are and still need the file's data
+    if prepared is not image:
+        image.close()
+    return prepared
+
+
+@functools.lru_cache(maxsize=1)
+def _load_tesserocr():
+    """
+    Import tesserocr on first use, or None if it isn't installed.
+
+    Deferred so OCR worker processes can set OMP_THREAD_LIMIT before
+    libtesseract brings up its OpenMP runtime, which reads it once on load.
+    """
+    try:
+        import tesserocr
+    except ImportError:
+        return None
+    return tesserocr
+
+
+def _get_api():
+    """Get this process's tesserocr API, or None to use the tesseract executable."""
+    global _api
+    if _api is None:
+        _api = False
+        tesserocr = _load_tesserocr()
+        if tesserocr is not None:
+            try:
+                _api = tesserocr.PyTessBaseAPI()
+            except RuntimeError as e:
+                print(f"tesserocr failed to load, using the tesseract executable: {e}")
+    return _api or None
+
+
+@functools.lru_cache(maxsize=1)
 def is_tesseract_available() -> bool:
-    """Check if Tesseract is available."""
+    """Check if Tesseract is available (checked once, it starts a process)."""
+    # Listing tessdata languages doesn't load a model into this process
+    tesserocr = _load_tesserocr()
+    if tesserocr is not None and tesserocr.get_languages()[1]:
+        return True
+
     try:
         # Try to configure tesseract path first
         configure_tesseract()
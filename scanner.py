@@ -1,6 +1,17 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from itertools import chain, islice
+from operator import itemgetter
 from pathlib import Path
 from typing import Callable, Optional
 
+from PIL import Image
+
 import config
 import database
 import ocr_engine
@@ -8,33 +19,111 @@ import ocr_engine
 # Supported image extensions
 IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'}
 
+# Number of OCR results buffered before they are written in one transaction
+BATCH_SIZE = 100
+
+# OCR runs in this many worker processes. Each worker starts Tesseract
+# once per batch of up to OCR_BATCH_SIZE images instead of once per image.
+OCR_WORKERS = os.cpu_count() or 1
+OCR_BATCH_SIZE = 25
+
+# Batches handed to the pool ahead of the one being written, per worker.
+# Anything not yet submitted is never started if the scan stops early.
+OCR_BATCHES_IN_FLIGHT = 2
+
+# How often (seconds) a scan waiting on OCR checks whether it's been stopped
+STOP_POLL_INTERVAL = 0.1
+
+# progress_callback is called at most this often (seconds), plus once for
+# the last file, so a fast run of skipped or blank images doesn't flood it
+PROGRESS_INTERVAL = 0.05
+
+# Threads running thumb_callback, so thumbnails are made alongside OCR rather
+# than holding up the loop that collects OCR results and submits new batches
+THUMBNAIL_WORKERS = 4
+
+# Threads listing folders concurrently in get_all_images()
+WALK_WORKERS = 8
 
-def get_all_images(folder: Path) -> list[Path]:
+
+def get_all_images(folder: Path, since: Optional[float] = None) -> list[str]:
     """
     Recursively find all image files in a folder.
 
     Args:
         folder: Root folder to scan
+        since: Only find images modified at or after this timestamp
 
     Returns:
-        List of Path objects for all image files
+        Paths of all image files as strings, newest first
     """
-    images = []
+    return [path for path, _ in _find_images(str(Path(folder)), since)]
+
 
-    for ext in IMAGE_EXTENSIONS:
-        # Case-insensitive glob on Windows
-        images.extend(folder.rglob(f"*{ext}"))
-        images.extend(folder.rglob(f"*{ext.upper()}"))
+def _find_images(folder: str, since: Optional[float] = None) -> list[tuple[str, float]]:
+    """Get (path, mtime) for images under folder modified at or after since, newest first."""
+    images = list(_walk_images(folder, since))
+    # Sorted on the mtimes from the walk, so nothing is stat'ed again
+    images.sort(key=itemgetter(1), reverse=True)
+    return images
 
-    # Remove duplicates (in case of case-insensitive filesystem)
-    unique_images = list(set(images))
 
-    return sorted(unique_images, key=lambda p: p.stat().st_mtime, reverse=True)
+def _walk_images(folder: str, since: Optional[float] = None):
+    """
+    Yield (path, mtime) for every image under folder in a single pass.
+
+    Extensions are matched case-insensitively, so each directory is read
+    once rather than once per extension. Folders are listed on a small
+    thread pool, so on a cold disk cache several directory reads and stats
+    are waiting on the disk at once instead of one after another.
+    """
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as executor:
+        running = {executor.submit(_scan_folder, folder, since)}
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                subfolders, images = future.result()
+                running.update(executor.submit(_scan_folder, subfolder, since) for subfolder in subfolders)
+                yield from images
+
+
+def _scan_folder(folder: str, since: Optional[float] = None) -> tuple[list[str], list[tuple[str, float]]]:
+    """
+    List one folder's subfolders and (path, mtime) for its images.
+
+    The mtime comes from the directory listing (cached by DirEntry on
+    Windows), so files aren't stat'ed a second time for sorting.
+    """
+    subfolders = []
+    images = []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    # Like rglob, don't descend into symlinked folders
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                        mtime = entry.stat().st_mtime
+                        # >= so a file saved later with the same (coarse)
+                        # timestamp as the cutoff isn't missed; files the
+                        # last scan saw are dropped as already indexed
+                        if since is None or mtime >= since:
+                            images.append((entry.path, mtime))
+                except OSError:
+                    pass  # Vanished or unreadable file
+    except OSError:
+        pass  # Unreadable folder; skip it like rglob does
+
+    return subfolders, images
 
 
 def scan_and_index(
     folder: Optional[Path] = None,
-    progress_callback: Optional[Callable[[int, int, str], None]] = None
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    thumb_callback: Optional[Callable[[str, Image.Image], None]] = None,
+    full_rescan: bool = False,
+    stop_event: Optional[threading.Event] = None
 ) -> dict:
     """
     Scan a folder for images and index them using OCR.
@@ -42,43 +131,197 @@ def scan_and_index(
     Args:
         folder: Folder to scan (defaults to configured screenshots folder)
         progress_callback: Optional callback function(current, total, filename)
+        thumb_callback: Optional callback function(file_path, image), given each
+            newly indexed image (opened, not yet decoded) once it's been OCR'd;
+            called from several threads at once
+        full_rescan: Look at every image, not just those modified since the
+            last completed scan of this folder (e.g. to pick up files copied in
+            with an older date)
+        stop_event: Optional event that stops the scan early when set; what
+            was OCR'd so far is kept
 
     Returns:
         Dict with 'indexed', 'skipped', and 'failed' counts
     """
     if folder is None:
-        folder = Path(config.get_screenshots_folder())
+        folder = config.get_screenshots_folder()
+    # Normalized the way Path always has, so walked paths keep matching the
+    # ones already in the database; from here on, paths stay strings
+    folder = str(Path(folder))
 
     # Ensure database is initialized
     database.init_db()
 
-    # Get all images
-    images = get_all_images(folder)
-    total = len(images)
+    # Files modified before the last completed scan were all seen by it
+    since = None if full_rescan else database.get_last_scan_mtime(folder)
+    scan_started = time.time()
+
+    # Get all images (only new or changed ones after the first scan)
+    images = _find_images(folder, since)
 
     stats = {'indexed': 0, 'skipped': 0, 'failed': 0}
 
-    for i, image_path in enumerate(images):
-        file_path_str = str(image_path)
+    if since is None:
+        # One query up front instead of an is_indexed() lookup per file
+        indexed_paths = database.get_indexed_paths()
+        todo = [path for path, _ in images if path not in indexed_paths]
+    else:
+        # Usually only a handful of files, so look each one up
+        todo = [path for path, _ in images if not database.is_indexed(path)]
+    stats['skipped'] = len(images) - len(todo)
+    total = len(images)
+
+    if not todo:
+        _save_last_scan_mtime(folder, images, scan_started)
+        return stats
+
+    # OCR results waiting to be written
+    pending = []
+    done = stats['skipped']
+    last_report = 0.0
 
-        # Report progress
-        if progress_callback:
-            progress_callback(i + 1, total, image_path.name)
+    # Batches are spread evenly so a small scan still uses every worker
+    workers = min(OCR_WORKERS, len(todo))
+    batch_size = min(OCR_BATCH_SIZE, -(-len(todo) // workers))
+    batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
 
-        # Skip if already indexed
-        if database.is_indexed(file_path_str):
-            stats['skipped'] += 1
-            continue
+    # Tesseract is CPU-bound, so batches are OCR'd in separate processes;
+    # results come back in order and are written from this thread. Workers
+    # are spawned, as on Windows, rather than forked from this threaded Tk
+    # process with libtesseract already loaded.
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_ocr_worker
+    )
+    thumb_pool = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS)
+    try:
+        ocr_batch = partial(ocr_engine.extract_text_batch, tiled=config.get_tiled_ocr())
+        results = _map_bounded(
+            executor, ocr_batch, batches, workers * OCR_BATCHES_IN_FLIGHT, stop_event
+        )
+        for file_path_str, text in zip(todo, chain.from_iterable(results)):
+            if stop_event is not None and stop_event.is_set():
+                break
 
-        # Extract text
-        text = ocr_engine.extract_text(file_path_str)
+            done += 1
+
+            # Report progress
+            if progress_callback:
+                now = time.monotonic()
+                if now - last_report >= PROGRESS_INTERVAL or done == total:
+                    last_report = now
+                    progress_callback(done, total, os.path.basename(file_path_str))
+
+            if thumb_callback:
+                thumb_pool.submit(_make_thumbnail, thumb_callback, file_path_str)
 
-        if text:
-            database.add_screenshot(file_path_str, text)
-            stats['indexed'] += 1
-        else:
             # Still add to database with empty text so we don't retry
-            database.add_screenshot(file_path_str, "")
-            stats['failed'] += 1
+            pending.append((file_path_str, text))
+            if text:
+                stats['indexed'] += 1
+            else:
+                stats['failed'] += 1
+
+            if len(pending) >= BATCH_SIZE:
+                database.add_screenshots(pending)
+                pending.clear()
+
+        # Let the last thumbnails finish unless the scan was stopped
+        if stop_event is None or not stop_event.is_set():
+            thumb_pool.shutdown()
+    finally:
+        # A stopped scan (e.g. the window closed) doesn't wait for the
+        # batches being OCR'd, which can take a while each
+        if stop_event is not None and stop_event.is_set():
+            _stop_workers(executor)
+
+        # Don't start OCR for batches still queued if the scan stops early
+        executor.shutdown(cancel_futures=True)
+        thumb_pool.shutdown(cancel_futures=True)
+
+        # Keep whatever was OCR'd even if the scan stops early
+        if pending:
+            database.add_screenshots(pending)
+
+    # Only a scan that got through every file moves the cutoff forward
+    if stop_event is None or not stop_event.is_set():
+        _save_last_scan_mtime(folder, images, scan_started)
 
     return stats
+
+
+def _map_bounded(executor, fn, items, limit: int, stop_event: Optional[threading.Event] = None):
+    """
+    Like executor.map(), but with at most limit items submitted at a time.
+
+    map() submits everything up front, and at interpreter exit the pool
+    runs whatever was submitted, even if nothing will read the results.
+    Stops yielding as soon as stop_event is set, even mid-item.
+    """
+    items = iter(items)
+    running = deque(executor.submit(fn, item) for item in islice(items, limit))
+    while running:
+        future = running.popleft()
+        while stop_event is not None and not future.done():
+            if stop_event.wait(STOP_POLL_INTERVAL):
+                return
+        result = future.result()
+        running.extend(executor.submit(fn, item) for item in islice(items, 1))
+        yield result
+
+
+def _stop_workers(executor: ProcessPoolExecutor):
+    """Kill a pool's worker processes, abandoning the work they're running."""
+    terminate = getattr(executor, 'terminate_workers', None)
+    if terminate is not None:
+        terminate()
+        return
+    # Before Python 3.14 the processes are only reachable privately
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+
+
+def _save_last_scan_mtime(folder: str, images: list[tuple[str, float]], scan_started: float):
+    """Remember the newest mtime a completed scan saw, for the next scan."""
+    if not images:
+        return
+    # Capped at the scan's start so a file dated in the future (clock skew,
+    # a network share) can't hide everything saved before that date
+    database.set_last_scan_mtime(folder, min(images[0][1], scan_started))
+
+
+def _init_ocr_worker():
+    """Set up an OCR worker process."""
+    # Parallelism comes from the worker processes; Tesseract's own OpenMP
+    # threads would just compete with them for cores. Only this process's
+    # environment changes, and ocr_engine loads tesserocr after this runs.
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    ocr_engine.configure_tesseract()
+
+
+def _make_thumbnail(thumb_callback: Callable[[str, Image.Image], None], file_path: str):
+    """Open an image and pass it to thumb_callback (runs on a thumbnail thread)."""
+    image = _open_image(file_path)
+    if image is None:
+        return
+    # A thumbnail that can't be made must never stop indexing
+    try:
+        with image:
+            thumb_callback(file_path, image)
+    except Exception as e:
+        print(f"Failed to cache thumbnail for {file_path}: {e}")
+
+
+def _open_image(file_path: str) -> Optional[Image.Image]:
+    """
+    Open an image, or None if it can't be read.
+
+    Only the header is read here. Pixels are decoded if the callback uses
+    them, so a thumbnail that's already cached costs no decode at all.
+    """
+    try:
+        return Image.open(file_path)
+    except Exception:
+        # Not just OSError: oversized images raise DecompressionBombError
+        return None
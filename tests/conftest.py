@@ -0,0 +1,26 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# The app's modules live at the repo root rather than in a package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+import database
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point the database (and config) at a fresh temp directory."""
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "screenshots.db")
+    # Connections are kept per thread, so drop any opened on another DB
+    monkeypatch.setattr(database, "_local", threading.local())
+    monkeypatch.setattr(database, "_folders_cache", None)
+    monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.json")
+    monkeypatch.setattr(config, "_cache", None)
+    yield database.DB_PATH
+    conn = getattr(database._local, "conn", None)
+    if conn is not None:
+        conn.close()
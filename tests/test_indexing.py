@@ -0,0 +1,197 @@
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pytesseract
+from PIL import Image, ImageDraw
+
+import database
+import ocr_engine
+import scanner
+
+
+def _save_image(path, mtime=None, text=True):
+    """Write a small PNG (with some dark pixels unless text is False)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image = Image.new("RGB", (80, 30), "white")
+    if text:
+        ImageDraw.Draw(image).text((5, 5), "hi", fill="black")
+    image.save(path)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+# Schema migration
+
+def test_migrates_v0_database(temp_db):
+    # The original layout: everything in one FTS table, user_version 0
+    conn = sqlite3.connect(temp_db)
+    conn.execute("CREATE VIRTUAL TABLE screenshots USING fts5(file_path, extracted_text, indexed_date)")
+    conn.executemany(
+        "INSERT INTO screenshots (file_path, extracted_text, indexed_date) VALUES (?, ?, ?)",
+        [
+            ("/shots/a.png", "running the build", "2024-01-01T00:00:00"),
+            ("/shots/b.png", "café menu", "2024-01-02T00:00:00"),
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+    database.init_db()
+
+    conn = database.get_connection()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == database.SCHEMA_VERSION
+    assert database.get_indexed_paths() == {"/shots/a.png", "/shots/b.png"}
+    assert database.get_screenshot_text("/shots/a.png") == "running the build"
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'screenshots_old'").fetchone() is None
+
+    # The rebuilt index stems and folds diacritics
+    assert [r["file_path"] for r in database.search("run")] == ["/shots/a.png"]
+    assert [r["file_path"] for r in database.search("cafe")] == ["/shots/b.png"]
+
+
+def test_migrates_v2_database(temp_db):
+    # v2: content table plus an external-content index with the default tokenizer
+    conn = sqlite3.connect(temp_db)
+    conn.executescript("""
+        CREATE TABLE screenshots_meta (
+            id INTEGER PRIMARY KEY,
+            file_path TEXT NOT NULL UNIQUE,
+            extracted_text TEXT,
+            indexed_date TEXT
+        );
+        CREATE VIRTUAL TABLE screenshots USING fts5(
+            file_path UNINDEXED, extracted_text, indexed_date UNINDEXED,
+            content='screenshots_meta', content_rowid='id'
+        );
+        INSERT INTO screenshots_meta (file_path, extracted_text, indexed_date)
+        VALUES ('/shots/a.png', 'running the build', '2024-01-01T00:00:00');
+        INSERT INTO screenshots (rowid, file_path, extracted_text, indexed_date)
+        SELECT id, file_path, extracted_text, indexed_date FROM screenshots_meta;
+        PRAGMA user_version = 2;
+    """)
+    conn.close()
+
+    database.init_db()
+
+    assert [r["file_path"] for r in database.search("run")] == ["/shots/a.png"]
+
+    # Triggers still keep the rebuilt index in sync
+    database.add_screenshots([("/shots/b.png", "deployment log")])
+    assert [r["file_path"] for r in database.search("deployment")] == ["/shots/b.png"]
+
+
+def test_init_db_is_idempotent(temp_db):
+    database.init_db()
+    database.add_screenshots([("/shots/a.png", "hello world")])
+    database.init_db()
+    assert [r["file_path"] for r in database.search("hello")] == ["/shots/a.png"]
+
+
+# Incremental rescan cutoff
+
+def test_find_images_keeps_files_at_the_cutoff(tmp_path):
+    old = _save_image(tmp_path / "old.png", mtime=1000)
+    same = _save_image(tmp_path / "sub" / "same.png", mtime=2000)
+    new = _save_image(tmp_path / "new.png", mtime=3000)
+
+    assert scanner._find_images(str(tmp_path)) == [(new, 3000), (same, 2000), (old, 1000)]
+    assert [path for path, _ in scanner._find_images(str(tmp_path), since=2000)] == [new, same]
+
+
+def test_rescan_only_looks_at_new_files(temp_db, tmp_path):
+    folder = tmp_path / "shots"
+    _save_image(folder / "a.png", mtime=1000)
+    _save_image(folder / "sub" / "b.png", mtime=2000)
+
+    stats = scanner.scan_and_index(str(folder))
+    assert stats["skipped"] == 0
+    assert database.get_stats()["total_indexed"] == 2
+    assert database.get_last_scan_mtime(str(folder)) == 2000
+
+    # Saved later with the same coarse timestamp as the cutoff
+    _save_image(folder / "c.png", mtime=2000)
+    # Copied in with an older date: only a full rescan finds it
+    _save_image(folder / "copied.png", mtime=500)
+
+    stats = scanner.scan_and_index(str(folder))
+    # b.png sits on the cutoff too and is recognised as already indexed
+    assert stats["skipped"] == 1
+    assert database.get_indexed_paths() == {
+        str(folder / "a.png"), str(folder / "sub" / "b.png"), str(folder / "c.png")
+    }
+
+    stats = scanner.scan_and_index(str(folder), full_rescan=True)
+    assert stats["skipped"] == 3
+    assert str(folder / "copied.png") in database.get_indexed_paths()
+
+
+def test_stopped_scan_keeps_the_old_cutoff(temp_db, tmp_path):
+    folder = tmp_path / "shots"
+    _save_image(folder / "a.png", mtime=1000)
+    stop = threading.Event()
+    stop.set()
+
+    scanner.scan_and_index(str(folder), stop_event=stop)
+
+    assert database.get_last_scan_mtime(str(folder)) is None
+
+
+# _map_bounded
+
+def test_map_bounded_keeps_order_and_limits_submissions():
+    submitted = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        submit = executor.submit
+
+        def tracking_submit(fn, item):
+            submitted.append(item)
+            return submit(fn, item)
+
+        executor.submit = tracking_submit
+        results = scanner._map_bounded(executor, lambda x: x * 2, range(10), 3)
+
+        assert next(results) == 0
+        # One taken, so one more submitted beyond the first three
+        assert submitted == [0, 1, 2, 3]
+        assert list(results) == [2 * x for x in range(1, 10)]
+
+
+# Batch OCR page splitting
+
+@pytest.fixture
+def no_tesserocr(monkeypatch):
+    """Force the tesseract executable path, whether or not tesserocr is installed."""
+    monkeypatch.setattr(ocr_engine, "_api", False)
+
+
+def test_image_list_output_is_split_on_form_feeds(tmp_path, monkeypatch, no_tesserocr):
+    first = _save_image(tmp_path / "1.png")
+    blank = _save_image(tmp_path / "2.png", text=False)
+    second = _save_image(tmp_path / "3.png")
+    missing = str(tmp_path / "missing.png")
+
+    def fake_image_to_string(list_path, **kwargs):
+        listed = open(list_path).read().splitlines()
+        assert len(listed) == 2  # Blank and unreadable images aren't OCR'd
+        return "".join(f" page {n} \n\f" for n in range(len(listed)))
+
+    monkeypatch.setattr(pytesseract, "image_to_string", fake_image_to_string)
+
+    assert ocr_engine.extract_text_batch([first, blank, missing, second]) == ["page 0", "", "", "page 1"]
+
+
+def test_mismatched_page_count_falls_back_to_single_images(tmp_path, monkeypatch, no_tesserocr):
+    paths = [_save_image(tmp_path / f"{n}.png") for n in range(3)]
+
+    def fake_image_to_string(image, **kwargs):
+        if isinstance(image, str):
+            return "only one page\f"
+        return "single"
+
+    monkeypatch.setattr(pytesseract, "image_to_string", fake_image_to_string)
+
+    assert ocr_engine.extract_text_batch(paths) == ["single"] * 3
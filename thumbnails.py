@@ -0,0 +1,199 @@
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from PIL import Image
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Generated thumbnails live next to the app, like config.json and the database
+CACHE_DIR = Path(__file__).parent / "thumbnails"
+
+# Least recently used thumbnails beyond this count are removed by prune_cache()
+MAX_CACHED_THUMBNAILS = 5000
+
+# Cached thumbnails are small JPEGs; recently read ones also stay decoded in memory
+THUMBNAIL_JPEG_QUALITY = 85
+MAX_THUMBNAILS_IN_MEMORY = 200
+
+# Thumbnail misses decode the source down to this size and keep the result in
+# a small in-memory LRU, so opening the preview right after doesn't decode again
+SOURCE_DECODE_SIZE = (500, 500)
+MAX_DECODED_SOURCES = 8
+
+_decoded_sources = OrderedDict()
+_decoded_lock = threading.Lock()
+
+
+def get_cache_path(file_path: str, size: tuple[int, int]) -> Path:
+    """Get the cache file for an image; changes whenever the image is modified."""
+    st = os.stat(file_path)
+    key_source = f"{file_path}|{st.st_mtime_ns}|{st.st_size}|{size[0]}x{size[1]}".encode()
+    if xxhash is not None:
+        key = xxhash.xxh64(key_source).hexdigest()
+    else:
+        key = hashlib.blake2b(key_source, digest_size=8).hexdigest()
+    # Two-level layout keeps any one directory from growing huge
+    return CACHE_DIR / key[:2] / f"{key}.jpg"
+
+
+def get_thumbnail(file_path: str, size: tuple[int, int]) -> Image.Image:
+    """
+    Get a thumbnail for an image, using the disk cache when possible.
+
+    Args:
+        file_path: Path to the image file
+        size: Maximum (width, height) of the thumbnail
+
+    Returns:
+        Thumbnail as a loaded PIL image
+    """
+    cache_path = get_cache_path(file_path, size)
+
+    try:
+        return _read_cached_thumbnail(str(cache_path))
+    except OSError:
+        pass  # Not cached yet (or unreadable), generate it below
+
+    return _save_thumbnail(file_path, _decode_source(file_path), size, cache_path)
+
+
+def cache_thumbnail(file_path: str, image: Image.Image, size: tuple[int, int]):
+    """Cache a thumbnail from an image the caller has already opened."""
+    cache_path = get_cache_path(file_path, size)
+    if not cache_path.exists():
+        # Lets a JPEG that hasn't been decoded yet decode at reduced scale
+        image.draft('RGB', (size[0] * 2, size[1] * 2))
+        _save_thumbnail(file_path, image, size, cache_path)
+
+
+def _save_thumbnail(file_path: str, source: Image.Image, size: tuple[int, int], cache_path: Path) -> Image.Image:
+    """Shrink a decoded image to a thumbnail and write it to the disk cache."""
+    # Bilinear is indistinguishable from Lanczos at thumbnail size and cheaper
+    image = _shrink(source, size, Image.Resampling.BILINEAR)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so readers never see a partial JPEG
+        temp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+        image.save(temp_path, "JPEG", quality=THUMBNAIL_JPEG_QUALITY, optimize=True)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Failed to cache thumbnail for {file_path}: {e}")
+
+    return image
+
+
+@functools.lru_cache(maxsize=MAX_THUMBNAILS_IN_MEMORY)
+def _read_cached_thumbnail(cache_path: str) -> Image.Image:
+    """Load a cached thumbnail file; failures raise and are not memoized."""
+    image = Image.open(cache_path)
+    image.load()
+    # Mark as recently used for prune_cache()
+    os.utime(cache_path)
+    return image
+
+
+def get_preview(file_path: str, size: tuple[int, int]) -> Image.Image:
+    """
+    Get a preview-sized image, reusing a recently decoded source if there is one.
+
+    Args:
+        file_path: Path to the image file
+        size: Maximum (width, height) of the preview
+
+    Returns:
+        Preview as a loaded PIL image
+    """
+    if size[0] > SOURCE_DECODE_SIZE[0] or size[1] > SOURCE_DECODE_SIZE[1]:
+        return _open_for_thumb(file_path, size)
+
+    # Decoding through the source cache means clicking the same screenshot
+    # again, or previewing it in the other layout, doesn't decode it again
+    source = _get_decoded_source(file_path)
+    if source is None:
+        source = _decode_source(file_path)
+    return _shrink(source, size, Image.Resampling.LANCZOS)
+
+
+def _decode_source(file_path: str) -> Image.Image:
+    """Decode an image at SOURCE_DECODE_SIZE scale and remember it."""
+    # Shrunk before caching so each entry stays under a megabyte
+    image = _open_for_thumb(file_path, SOURCE_DECODE_SIZE)
+
+    key = (file_path, os.path.getmtime(file_path))
+    with _decoded_lock:
+        _decoded_sources[key] = image
+        _decoded_sources.move_to_end(key)
+        while len(_decoded_sources) > MAX_DECODED_SOURCES:
+            _decoded_sources.popitem(last=False)
+
+    return image
+
+
+def _open_for_thumb(file_path: str, target: tuple[int, int]) -> Image.Image:
+    """
+    Open an image and shrink it to fit target, decoding as little as possible.
+
+    draft() lets libjpeg decode JPEGs at 1/2, 1/4 or 1/8 scale (it's a no-op
+    for other formats). Asking for twice the target leaves headroom for a
+    clean Lanczos pass. The file is never copy()'d, which would force a
+    full-resolution decode.
+    """
+    image = Image.open(file_path)
+    image.draft('RGB', (target[0] * 2, target[1] * 2))
+    image.thumbnail(target, Image.Resampling.LANCZOS)
+    return image
+
+
+def _shrink(image: Image.Image, size: tuple[int, int], resample) -> Image.Image:
+    """Get a version of a decoded image that fits in size, never upscaling."""
+    scale = min(size[0] / image.width, size[1] / image.height)
+    if scale >= 1:
+        return image
+    new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    # resize() returns a new image, leaving the shared source untouched
+    return image.resize(new_size, resample)
+
+
+def _get_decoded_source(file_path: str):
+    """Get a remembered decoded image, or None if it isn't cached or is stale."""
+    key = (file_path, os.path.getmtime(file_path))
+    with _decoded_lock:
+        image = _decoded_sources.get(key)
+        if image is not None:
+            _decoded_sources.move_to_end(key)
+        return image
+
+
+def prune_cache():
+    """Remove the least recently used thumbnails beyond MAX_CACHED_THUMBNAILS."""
+    if not CACHE_DIR.exists():
+        return
+
+    entries = []
+    for dir_path, _, file_names in os.walk(CACHE_DIR):
+        for name in file_names:
+            path = os.path.join(dir_path, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+
+    if len(entries) <= MAX_CACHED_THUMBNAILS:
+        return
+
+    entries.sort(reverse=True)
+    for _, path in entries[MAX_CACHED_THUMBNAILS:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass